@@ -382,6 +382,10 @@ def serialize_entry(entry: Entry) -> Dict[str, object]:
     }
 
 
+# DATASET is static, so random fallbacks can share pre-serialised payloads.
+SERIALIZED_DATASET: Tuple[Dict[str, object], ...] = tuple(serialize_entry(entry) for entry in DATASET)
+
+
 if Flask:
 
     @app.get("/")
@@ -411,8 +415,7 @@ if Flask:
 
     @app.get("/api/random")
     def random_entry():
-        entry = random.choice(DATASET)
-        return jsonify({"label": "Random Spotlight", "result": serialize_entry(entry)})
+        return jsonify({"label": "Random Spotlight", "result": random.choice(SERIALIZED_DATASET)})
 
     if __name__ == "__main__":
         app.run(debug=True)
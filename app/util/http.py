@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import threading
+import time
 from typing import Any, Dict
 
 import requests
@@ -10,6 +12,41 @@ except Exception:  # pragma: no cover
     from urllib3.util import Retry  # type: ignore
 import streamlit as st
 
+try:  # optional: faster JSON decoding when available
+    import orjson  # type: ignore
+except Exception:  # pragma: no cover
+    orjson = None  # type: ignore
+
+# Sized for the parallel entry builds and attribute-index fill in streamlit_app.
+POOL_MAXSIZE = 32
+
+# Client-side courtesy limit for PokéAPI; bursts up to the pool size, then 20 req/s.
+RATE_LIMIT_PER_SECOND = 20.0
+
+
+class _TokenBucket:
+    """Thread-safe O(1) token bucket; callers sleep outside the lock."""
+
+    def __init__(self, rate: float, capacity: float) -> None:
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.last) * self.rate)
+            self.last = now
+            # Reserve the token now (possibly going negative) so waiters queue fairly.
+            self.tokens -= 1.0
+            wait = -self.tokens / self.rate if self.tokens < 0 else 0.0
+        if wait > 0:
+            time.sleep(wait)
+
+
+_bucket = _TokenBucket(RATE_LIMIT_PER_SECOND, float(POOL_MAXSIZE))
 _session = requests.Session()
 retries = Retry(
     total=5,
@@ -19,19 +56,37 @@ retries = Retry(
     status_forcelist=(429, 500, 502, 503, 504),
     allowed_methods=frozenset({"GET", "HEAD"}),
 )
-_session.mount("https://", HTTPAdapter(max_retries=retries))
+_session.mount(
+    "https://",
+    HTTPAdapter(max_retries=retries, pool_connections=4, pool_maxsize=POOL_MAXSIZE),
+)
 _session.headers.update({"User-Agent": "PokeSearch/1.0 (+streamlit)"})
 
 
+def _decode_json(resp: requests.Response) -> Any:
+    if orjson is not None:
+        return orjson.loads(resp.content)
+    return resp.json()
+
+
 @st.cache_data(show_spinner=False, ttl=60 * 60 * 12)
 def get_json(url: str, timeout: float = 5.0) -> Dict[str, Any]:
+    _bucket.acquire()
     resp = _session.get(url, timeout=timeout)
     resp.raise_for_status()
-    return resp.json()
+    return _decode_json(resp)
 
 
 @st.cache_data(show_spinner=False, ttl=60 * 60 * 2)
 def get_bytes(url: str, timeout: float = 5.0) -> bytes:
+    _bucket.acquire()
     resp = _session.get(url, timeout=timeout)
     resp.raise_for_status()
     return resp.content
+
+
+def post_json(url: str, payload: Dict[str, Any], timeout: float = 5.0) -> Dict[str, Any]:
+    _bucket.acquire()
+    resp = _session.post(url, json=payload, timeout=timeout)
+    resp.raise_for_status()
+    return _decode_json(resp)
@@ -0,0 +1,13 @@
+from __future__ import annotations
+
+import functools
+import random
+from typing import Tuple
+
+
+# Lives outside streamlit_app so the cache survives reruns: the random-pick cursor
+# walks one permutation per filter pool, and reshuffling it on every click would
+# cost a full O(n) sample each time.
+@functools.lru_cache(maxsize=32)
+def shuffled_order(seed: int, size: int) -> Tuple[int, ...]:
+    return tuple(random.Random(seed).sample(range(size), size))
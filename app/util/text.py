@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+import functools
+import re
+import unicodedata
+
+# Helpers memoised here rather than in streamlit_app: Streamlit re-executes the main
+# script on every rerun, which would hand each rerun a fresh, empty lru_cache.
+
+_SLUG_RE = re.compile(r"[^a-z0-9]+")
+
+
+@functools.lru_cache(maxsize=4096)
+def slugify_pokemon_name(name: str) -> str:
+    # Handle gendered names before normalisation
+    name = name.replace("♀", " f").replace("♂", " m")
+    # Normalize unicode (e.g., é -> e) then keep [a-z0-9-]
+    normalized = (
+        unicodedata.normalize("NFKD", name)
+        .encode("ascii", "ignore")
+        .decode("ascii")
+        .lower()
+    )
+    return _SLUG_RE.sub("-", normalized).strip("-")
+
+
+@functools.lru_cache(maxsize=4096)
+def pokemon_icon_url(name: str, pid: int | None = None) -> str:
+    if pid:
+        return f"https://raw.githubusercontent.com/PokeAPI/sprites/master/sprites/pokemon/{pid}.png"
+    slug = slugify_pokemon_name(name)
+    return f"https://img.pokemondb.net/sprites/sword-shield/icon/{slug}.png"
+
+
+@functools.lru_cache(maxsize=1024)
+def titleize_slug(slug: str) -> str:
+    # Attribute, stage, trigger, item and location slugs repeat across every card, so title-case each once.
+    return slug.replace("-", " ").title()
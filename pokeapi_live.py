@@ -1,10 +1,15 @@
 from __future__ import annotations
 
+import functools
 import json
+import os
 import sys
+import tempfile
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Tuple, Optional
+from typing import Dict, Iterable, List, Tuple, Optional
 
 # Streamlit is optional at import time
 try:  # type: ignore[override]
@@ -12,16 +17,59 @@ try:  # type: ignore[override]
 except Exception:  # pragma: no cover
     st = None  # type: ignore
 
+# Optional faster JSON codec for the disk cache; stdlib json is the fallback.
+try:
+    import orjson  # type: ignore
+except Exception:  # pragma: no cover
+    orjson = None  # type: ignore
+
 APP_DIR = Path(__file__).parent / "app"
 if APP_DIR.exists():
     app_dir_str = str(APP_DIR)
     if app_dir_str not in sys.path:
         sys.path.insert(0, app_dir_str)
 
-from util.http import get_json
+from util.http import get_json, post_json
+from util.text import titleize_slug
 
 
 CACHE_TTL_SECONDS = 24 * 60 * 60
+# Highest national dex number the app lists (end of Generation IX).
+MAX_SPECIES_ID = 1025
+# enabled: read + write the disk cache, fetch on miss (default)
+# read_only: read the disk cache and fetch on miss, but never write files
+# replay: serve only what is already on disk; a miss raises CacheMissError
+CACHE_POLICIES = ("enabled", "read_only", "replay")
+CACHE_POLICY = os.environ.get("POKESEARCH_CACHE_POLICY", "enabled").strip().lower()
+if CACHE_POLICY not in CACHE_POLICIES:
+    # A typo would otherwise silently behave like read_only.
+    raise ValueError(
+        f"POKESEARCH_CACHE_POLICY must be one of {', '.join(CACHE_POLICIES)}; got {CACHE_POLICY!r}"
+    )
+GRAPHQL_URL = "https://beta.pokeapi.co/graphql/v1beta"
+FETCH_WORKERS = 8
+# Runs leaf fetches only (_get / evolution chain loads). Never submit work that
+# itself waits on this pool, or a full pool can deadlock on its own futures.
+_FETCH_POOL = ThreadPoolExecutor(max_workers=FETCH_WORKERS, thread_name_prefix="pokeapi-fetch")
+# Serialises the read-modify-write of cache/species_attributes.json within the process.
+_ATTRIBUTE_TABLE_LOCK = threading.Lock()
+SPECIES_ATTRIBUTES_QUERY = """
+query speciesAttributes($ids: [Int!]) {
+  pokemon_v2_pokemonspecies(where: {id: {_in: $ids}}) {
+    id
+    capture_rate
+    pokemon_v2_pokemoncolor { name }
+    pokemon_v2_pokemonhabitat { name }
+    pokemon_v2_pokemonshape { name }
+    pokemon_v2_generation { name }
+    pokemon_v2_pokemonegggroups { pokemon_v2_egggroup { name } }
+  }
+}
+"""
+
+
+class CacheMissError(LookupError):
+    """Raised in replay mode when a PokéAPI response is not cached on disk."""
 
 
 def _cache_dir() -> Path:
@@ -36,6 +84,8 @@ def _cache_dir() -> Path:
 
 def _read_json(path: Path):
     try:
+        if orjson is not None:
+            return orjson.loads(path.read_bytes())
         with path.open("r", encoding="utf-8") as f:
             return json.load(f)
     except FileNotFoundError:
@@ -43,30 +93,84 @@ def _read_json(path: Path):
 
 
 def _write_json(path: Path, data) -> None:
-    path.parent.mkdir(parents=True, exist_ok=True)
-    tmp = path.with_suffix(path.suffix + ".tmp")
-    with tmp.open("w", encoding="utf-8") as f:
-        json.dump(data, f, ensure_ascii=False)
-    tmp.replace(path)
+    if CACHE_POLICY != "enabled":
+        return
+    tmp_name = None
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # A unique temp file per writer: concurrent writes to one path (warmup thread vs
+        # script thread, parallel detail fetches) must not rename each other's file away.
+        with tempfile.NamedTemporaryFile(
+            dir=path.parent, prefix=path.name + ".", suffix=".tmp", delete=False
+        ) as f:
+            tmp_name = f.name
+            if orjson is not None:
+                # orjson always writes UTF-8, matching ensure_ascii=False below.
+                f.write(orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS))
+            else:
+                f.write(json.dumps(data, ensure_ascii=False).encode("utf-8"))
+        os.replace(tmp_name, path)
+    except Exception:
+        # The disk cache is best-effort; a failed write must not fail the caller.
+        if tmp_name is not None:
+            try:
+                os.unlink(tmp_name)
+            except OSError:
+                pass
 
 
 def _get(url: str) -> Dict:
+    if CACHE_POLICY == "replay":
+        raise CacheMissError(url)
     return get_json(url, timeout=30.0)
 
 
+def _post(url: str, payload: Dict) -> Dict:
+    if CACHE_POLICY == "replay":
+        raise CacheMissError(url)
+    return post_json(url, payload, timeout=30.0)
+
+
 def _now() -> int:
     return int(time.time())
 
 
+def _url_tail(href: str) -> str:
+    # PokeAPI resource URLs end in ".../{id}/"; slice the id out without split().
+    end = len(href) - 1 if href.endswith("/") else len(href)
+    return href[href.rfind("/", 0, end) + 1 : end]
+
+
 def _is_stale(path: Path, ttl: int = CACHE_TTL_SECONDS) -> bool:
+    if CACHE_POLICY == "replay":
+        return not path.exists()
     try:
         return _now() - int(path.stat().st_mtime) > ttl
     except FileNotFoundError:
         return True
 
 
-def load_species_index() -> List[Dict[str, object]]:
-    """Return list of {id, name} for all Pokémon species (<= 1025), cached."""
+def fallback_species_index() -> List[Dict[str, object]]:
+    """Return {id, name} for the Pokémon in the bundled local dataset."""
+    try:
+        from .PokeAPI import DATASET  # type: ignore
+
+        fallback = [
+            {"id": entry.index, "name": entry.name}
+            for entry in DATASET
+            if entry.category.lower() in {"pokémon", "pokemon"}
+        ]
+        fallback.sort(key=lambda x: int(x["id"]))
+        return fallback
+    except Exception:
+        return []
+
+
+def load_species_index(allow_fallback: bool = True) -> List[Dict[str, object]]:
+    """Return list of {id, name} for all Pokémon species (<= MAX_SPECIES_ID), cached.
+
+    With allow_fallback=False a failed fetch raises instead of returning the local dataset.
+    """
     cache_path = _cache_dir() / "species_index.json"
     if not _is_stale(cache_path):
         data = _read_json(cache_path)
@@ -74,7 +178,9 @@ def load_species_index() -> List[Dict[str, object]]:
             return data
 
     try:
-        url = "https://pokeapi.co/api/v2/pokemon-species?limit=20000"
+        # The list endpoint is ordered by id, so this fetches exactly the ids we keep
+        # instead of every species plus the alternate-form entries past the dex.
+        url = f"https://pokeapi.co/api/v2/pokemon-species?limit={MAX_SPECIES_ID}"
         payload = _get(url)
         out: List[Dict[str, object]] = []
         for item in payload.get("results", []):
@@ -82,28 +188,19 @@ def load_species_index() -> List[Dict[str, object]]:
             # URL has format .../pokemon-species/{id}/
             href = str(item.get("url", ""))
             try:
-                id_ = int(href.rstrip("/").split("/")[-1])
+                id_ = int(_url_tail(href))
             except Exception:
                 continue
-            if id_ <= 1025:
+            if id_ <= MAX_SPECIES_ID:
                 out.append({"id": id_, "name": name})
         out.sort(key=lambda x: int(x["id"]))
         _write_json(cache_path, out)
         return out
     except Exception:
+        if not allow_fallback:
+            raise
         # Fallback to local minimal dataset
-        try:
-            from .PokeAPI import DATASET  # type: ignore
-
-            fallback = [
-                {"id": entry.index, "name": entry.name}
-                for entry in DATASET
-                if entry.category.lower() in {"pokémon", "pokemon"}
-            ]
-            fallback.sort(key=lambda x: int(x["id"]))
-            return fallback
-        except Exception:
-            return []
+        return fallback_species_index()
 
 
 def load_type_index(type_name: str) -> List[int]:
@@ -120,7 +217,7 @@ def load_type_index(type_name: str) -> List[int]:
         for entry in payload.get("pokemon", []):
             href = str(entry.get("pokemon", {}).get("url", ""))
             try:
-                idx = int(href.rstrip("/").split("/")[-1])
+                idx = int(_url_tail(href))
             except Exception:
                 continue
             ids.append(idx)
@@ -131,6 +228,25 @@ def load_type_index(type_name: str) -> List[int]:
         return []
 
 
+_FLAVOR_TEXT_CLEANUP = str.maketrans({"\n": " ", "\f": " "})
+
+
+def _flavor_by_lang(species: Dict[str, object]) -> Dict[str, str]:
+    # First flavor text per language, whitespace-cleaned once at cache-fill time.
+    out: Dict[str, str] = {}
+    for entry in species.get("flavor_text_entries") or []:
+        lang = (entry.get("language") or {}).get("name")
+        if lang and lang not in out:
+            out[lang] = str(entry.get("flavor_text", "")).translate(_FLAVOR_TEXT_CLEANUP)
+    return out
+
+
+def _get_species(pokemon_id: int) -> Dict[str, object]:
+    species = _get(f"https://pokeapi.co/api/v2/pokemon-species/{pokemon_id}")
+    species["flavor_by_lang"] = _flavor_by_lang(species)
+    return species
+
+
 def load_species_detail(pokemon_id: int) -> Optional[Dict]:
     cache_base = _cache_dir()
     s_path = cache_base / "species" / f"{pokemon_id}.json"
@@ -138,48 +254,118 @@ def load_species_detail(pokemon_id: int) -> Optional[Dict]:
     if species:
         return species
     try:
-        species = _get(f"https://pokeapi.co/api/v2/pokemon-species/{pokemon_id}")
+        species = _get_species(pokemon_id)
         _write_json(s_path, species)
         return species
     except Exception:
         return None
 
 
+def _deref_name(value: object) -> object:
+    # PokeAPI named resources are {"name": ..., "url": ...}; older caches may hold bare strings.
+    return value.get("name") if isinstance(value, dict) else value
+
+
+@functools.lru_cache(maxsize=2048)
+def _intern_label(text: str) -> str:
+    # The attribute vocabulary is tiny; share one string object per value.
+    return sys.intern(text.lower())
+
+
+def _label(value: object) -> str:
+    name = _deref_name(value)
+    return _intern_label(str(name)) if name else ""
+
+
 def get_species_attributes(pokemon_id: int) -> Dict[str, object]:
-    species = load_species_detail(pokemon_id) or {}
-    color = (species.get("color") or {}).get("name") if isinstance(species.get("color"), dict) else species.get("color")
-    habitat = (species.get("habitat") or {}).get("name") if isinstance(species.get("habitat"), dict) else species.get("habitat")
-    shape = (species.get("shape") or {}).get("name") if isinstance(species.get("shape"), dict) else species.get("shape")
+    return _species_attributes(load_species_detail(pokemon_id) or {})
+
+
+def _species_attributes(species: Dict[str, object]) -> Dict[str, object]:
     capture_rate = species.get("capture_rate")
-    generation = (species.get("generation") or {}).get("name") if isinstance(species.get("generation"), dict) else species.get("generation")
-    egg_groups_raw = species.get("egg_groups") or []
     egg_groups = []
-    for group in egg_groups_raw:
-        if isinstance(group, dict):
-            name = group.get("name")
-        else:
-            name = group
+    for group in species.get("egg_groups") or []:
+        name = _label(group)
         if name:
-            egg_groups.append(str(name))
+            egg_groups.append(name)
     return {
-        "color": (color or "").lower(),
-        "habitat": (habitat or "").lower(),
-        "shape": (shape or "").lower(),
+        "color": _label(species.get("color")),
+        "habitat": _label(species.get("habitat")),
+        "shape": _label(species.get("shape")),
         "capture_rate": capture_rate if isinstance(capture_rate, int) else None,
-        "generation": (generation or "").lower(),
-        "egg_groups": [eg.lower() for eg in egg_groups],
+        "generation": _label(species.get("generation")),
+        "egg_groups": egg_groups,
     }
 
 
+def load_species_attributes_bulk(pokemon_ids: Iterable[int]) -> Dict[int, Dict[str, object]]:
+    """Return {id: attributes} for many species using one GraphQL request.
+
+    Results are kept in ``cache/species_attributes.json`` so later processes only
+    query ids they have never seen. Ids missing from the result (or every id, if
+    the request fails) are left for the caller to resolve through
+    get_species_attributes.
+    """
+    ids = sorted({int(pid) for pid in pokemon_ids})
+    if not ids:
+        return {}
+    table_path = _cache_dir() / "species_attributes.json"
+    table = _read_json(table_path)
+    if not isinstance(table, dict):
+        table = {}
+    out: Dict[int, Dict[str, object]] = {pid: table[str(pid)] for pid in ids if str(pid) in table}
+    missing = [pid for pid in ids if pid not in out]
+    if not missing:
+        return out
+    try:
+        payload = _post(
+            GRAPHQL_URL,
+            {"query": SPECIES_ATTRIBUTES_QUERY, "variables": {"ids": missing}},
+        )
+    except Exception:
+        return out
+    rows = (payload.get("data") or {}).get("pokemon_v2_pokemonspecies") or []
+    fetched: Dict[int, Dict[str, object]] = {}
+    for row in rows:
+        try:
+            species_id = int(row.get("id"))
+        except Exception:
+            continue
+        capture_rate = row.get("capture_rate")
+        egg_groups = []
+        for group in row.get("pokemon_v2_pokemonegggroups") or []:
+            name = _label(group.get("pokemon_v2_egggroup"))
+            if name:
+                egg_groups.append(name)
+        fetched[species_id] = {
+            "color": _label(row.get("pokemon_v2_pokemoncolor")),
+            "habitat": _label(row.get("pokemon_v2_pokemonhabitat")),
+            "shape": _label(row.get("pokemon_v2_pokemonshape")),
+            "capture_rate": capture_rate if isinstance(capture_rate, int) else None,
+            "generation": _label(row.get("pokemon_v2_generation")),
+            "egg_groups": egg_groups,
+        }
+    if fetched:
+        with _ATTRIBUTE_TABLE_LOCK:
+            # Re-read under the lock so rows another thread wrote meanwhile are merged, not lost.
+            table = _read_json(table_path)
+            if not isinstance(table, dict):
+                table = {}
+            table.update({str(pid): attrs for pid, attrs in fetched.items()})
+            _write_json(table_path, table)
+        out.update(fetched)
+    return out
+
+
+def _evolution_chain_path(chain_url: str) -> Path:
+    chain_id = _url_tail(chain_url) or "unknown"
+    return _cache_dir() / "evolution" / f"{chain_id}.json"
+
+
 def _load_evolution_chain(chain_url: str) -> Optional[Dict[str, object]]:
     if not chain_url:
         return None
-    cache_base = _cache_dir()
-    try:
-        chain_id = chain_url.rstrip("/").split("/")[-1]
-    except Exception:
-        chain_id = "unknown"
-    e_path = cache_base / "evolution" / f"{chain_id}.json"
+    e_path = _evolution_chain_path(chain_url)
     data = _read_json(e_path)
     if not data or _is_stale(e_path):
         try:
@@ -193,41 +379,49 @@ def _load_evolution_chain(chain_url: str) -> Optional[Dict[str, object]]:
 def _format_evo_trigger(detail: Dict[str, object]) -> str:
     if not detail:
         return ""
-    trigger = (detail.get("trigger") or {}).get("name", "")
-    trigger = trigger.replace("-", " ").title()
     min_level = detail.get("min_level")
     item = (detail.get("item") or {}).get("name")
     location = (detail.get("location") or {}).get("name")
     if item:
-        return f"Use {item.replace('-', ' ').title()}"
+        return f"Use {titleize_slug(item)}"
     if min_level:
         return f"Level {min_level}"
     if location:
-        return f"@ {location.replace('-', ' ').title()}"
-    return trigger
+        return f"@ {titleize_slug(location)}"
+    return titleize_slug((detail.get("trigger") or {}).get("name", ""))
 
 
-def _parse_chain(node: Dict[str, object]) -> Dict[str, object]:
+def _parse_chain_node(node: Dict[str, object]) -> Dict[str, object]:
     species = node.get("species") or {}
     name = str(species.get("name", ""))
     try:
-        species_id = int(str(species.get("url", "")).rstrip("/").split("/")[-1])
+        species_id = int(_url_tail(str(species.get("url", ""))))
     except Exception:
         species_id = 0
-    children_raw = node.get("evolves_to") or []
-    children = [_parse_chain(child) for child in children_raw]
     details_list = node.get("evolution_details") or []
     detail_text = _format_evo_trigger(details_list[0]) if details_list else ""
     return {
         "name": name,
         "id": species_id,
         "detail": detail_text,
-        "children": children,
+        "children": [],
     }
 
 
-def load_evolution_chain(chain_url: str) -> Optional[Dict[str, object]]:
-    data = _load_evolution_chain(chain_url)
+def _parse_chain(node: Dict[str, object]) -> Dict[str, object]:
+    # Walk the chain with an explicit stack; siblings are pushed in reverse so
+    # each parent's children keep the API's original order.
+    root = _parse_chain_node(node)
+    stack = [(child, root["children"]) for child in reversed(node.get("evolves_to") or [])]
+    while stack:
+        raw, siblings = stack.pop()
+        parsed = _parse_chain_node(raw)
+        siblings.append(parsed)
+        stack.extend((child, parsed["children"]) for child in reversed(raw.get("evolves_to") or []))
+    return root
+
+
+def _parse_chain_payload(data: Optional[Dict[str, object]]) -> Optional[Dict[str, object]]:
     if not data:
         return None
     chain = data.get("chain")
@@ -236,8 +430,59 @@ def load_evolution_chain(chain_url: str) -> Optional[Dict[str, object]]:
     return _parse_chain(chain)
 
 
+@functools.lru_cache(maxsize=512)
+def _load_parsed_chain(chain_url: str, stamp: int) -> Optional[Dict[str, object]]:
+    # ``stamp`` is the cache file's mtime, so a refreshed file is parsed again.
+    return _parse_chain_payload(_load_evolution_chain(chain_url))
+
+
+def load_evolution_chain(chain_url: str) -> Optional[Dict[str, object]]:
+    """Return the parsed chain tree; callers must treat it as read-only.
+
+    Every member of a family shares one chain, so a fresh on-disk copy is read
+    and parsed once per process instead of once per species.
+    """
+    if not chain_url:
+        return None
+    e_path = _evolution_chain_path(chain_url)
+    if not _is_stale(e_path):
+        try:
+            return _load_parsed_chain(chain_url, e_path.stat().st_mtime_ns)
+        except OSError:
+            pass
+    return _parse_chain_payload(_load_evolution_chain(chain_url))
+
+
+def _slim_pokemon(pokemon: Dict[str, object]) -> Dict[str, object]:
+    """Keep only the /pokemon fields build_entry_from_api renders.
+
+    The full payload carries every sprite variant, move and game index; the
+    slim copy is a small fraction of that on disk and to decode.
+    """
+    sprites = pokemon.get("sprites") or {}
+    other = sprites.get("other") or {}
+    slim_other = {
+        key: {"front_default": (other.get(key) or {}).get("front_default")}
+        for key in ("official-artwork", "home")
+    }
+    slim = {key: pokemon.get(key) for key in ("id", "name", "types", "abilities", "height", "weight")}
+    slim["stats"] = [
+        {"stat": {"name": s["stat"]["name"]}, "base_stat": s["base_stat"]}
+        for s in pokemon.get("stats") or []
+    ]
+    slim["sprites"] = {"front_default": sprites.get("front_default"), "other": slim_other}
+    return slim
+
+
+def _get_pokemon_slim(pokemon_id: int) -> Dict[str, object]:
+    return _slim_pokemon(_get(f"https://pokeapi.co/api/v2/pokemon/{pokemon_id}"))
+
+
 def load_pokemon_detail(pokemon_id: int) -> Tuple[Dict, Dict] | None:
-    """Return (pokemon, species) JSON dicts for id, cached on disk."""
+    """Return (pokemon, species) JSON dicts for id, cached on disk.
+
+    Freshly fetched pokemon payloads are slimmed before caching (see _slim_pokemon).
+    """
     cache_base = _cache_dir()
     p_path = cache_base / "pokemon" / f"{pokemon_id}.json"
     s_path = cache_base / "species" / f"{pokemon_id}.json"
@@ -248,10 +493,19 @@ def load_pokemon_detail(pokemon_id: int) -> Tuple[Dict, Dict] | None:
         return pokemon, species
 
     try:
-        pokemon = _get(f"https://pokeapi.co/api/v2/pokemon/{pokemon_id}")
-        species = _get(f"https://pokeapi.co/api/v2/pokemon-species/{pokemon_id}")
-        _write_json(p_path, pokemon)
-        _write_json(s_path, species)
+        # Fetch whichever halves are missing in parallel; they are independent requests.
+        pokemon_future = (
+            None if pokemon else _FETCH_POOL.submit(_get_pokemon_slim, pokemon_id)
+        )
+        species_future = (
+            None if species else _FETCH_POOL.submit(_get_species, pokemon_id)
+        )
+        if pokemon_future is not None:
+            pokemon = pokemon_future.result()
+            _write_json(p_path, pokemon)
+        if species_future is not None:
+            species = species_future.result()
+            _write_json(s_path, species)
         return pokemon, species
     except Exception:
         return None
@@ -262,6 +516,9 @@ def build_entry_from_api(pokemon_id: int, name: str) -> Dict[str, object] | None
     if not data:
         return None
     pokemon, species = data
+    # Start the evolution chain load now so it overlaps the payload processing below.
+    chain_url = str((species.get("evolution_chain") or {}).get("url", ""))
+    chain_future = _FETCH_POOL.submit(load_evolution_chain, chain_url) if chain_url else None
 
     types = [t["type"]["name"] for t in pokemon.get("types", [])]
     abilities = [a["ability"]["name"] for a in pokemon.get("abilities", [])]
@@ -276,15 +533,14 @@ def build_entry_from_api(pokemon_id: int, name: str) -> Dict[str, object] | None
         or sprites.get("front_default")
     )
 
-    # English flavor text if available
-    flavour = ""
-    for entry in species.get("flavor_text_entries", []):
-        lang = entry.get("language", {}).get("name")
-        if lang == "en":
-            flavour = str(entry.get("flavor_text", "")).replace("\n", " ").replace("\f", " ")
-            break
+    # English flavor text if available; older cache files predate flavor_by_lang.
+    flavor_by_lang = species.get("flavor_by_lang")
+    if not isinstance(flavor_by_lang, dict):
+        flavor_by_lang = _flavor_by_lang(species)
+    flavour = flavor_by_lang.get("en", "")
 
-    attrs = get_species_attributes(pokemon_id)
+    # The species payload is already in hand; don't re-read it from disk.
+    attrs = _species_attributes(species)
     metadata = {
         "color": attrs.get("color", ""),
         "habitat": attrs.get("habitat", ""),
@@ -293,8 +549,10 @@ def build_entry_from_api(pokemon_id: int, name: str) -> Dict[str, object] | None
         "generation": attrs.get("generation", ""),
         "egg_groups": attrs.get("egg_groups", []),
     }
-    chain_url = str((species.get("evolution_chain") or {}).get("url", ""))
-    evolution_chain = load_evolution_chain(chain_url) if chain_url else None
+    try:
+        evolution_chain = chain_future.result() if chain_future else None
+    except Exception:
+        evolution_chain = None
 
     sections: List[Dict[str, object]] = []
     sections.append(
@@ -2,17 +2,21 @@ from __future__ import annotations
 
 import base64
 import functools
-import html
 import json
 import random
 import re
-import unicodedata
-from datetime import datetime
+import threading
+import time
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timezone
 from io import BytesIO
+from itertools import islice
+from operator import itemgetter
 from pathlib import Path
-from typing import Callable, Dict, List, Sequence, Tuple, Set
+from typing import Callable, Dict, FrozenSet, List, Sequence, Tuple, Set, TypedDict
 
-import requests
 import streamlit as st
 import streamlit.components.v1 as components
 
@@ -27,40 +31,55 @@ except Exception:  # pragma: no cover - Pillow optional
 try:  # absolute import from package
     from PokeAPI import (
         CATEGORY_OPTIONS,
-        DATASET,
+        SERIALIZED_DATASET,
         apply_filters,
         parse_query,
-        serialize_entry,
     )
 except Exception:  # pragma: no cover
     try:
         from PokeAPI.PokeAPI import (
             CATEGORY_OPTIONS,
-            DATASET,
+            SERIALIZED_DATASET,
             apply_filters,
             parse_query,
-            serialize_entry,
         )
     except Exception:
         from importlib import import_module as _imp
         _m = _imp("PokeAPI.PokeAPI")
-        CATEGORY_OPTIONS, DATASET = _m.CATEGORY_OPTIONS, _m.DATASET
+        CATEGORY_OPTIONS = _m.CATEGORY_OPTIONS
         apply_filters, parse_query = _m.apply_filters, _m.parse_query
-        serialize_entry = _m.serialize_entry
+        SERIALIZED_DATASET = _m.SERIALIZED_DATASET
 
 try:
     from .pokeapi_live import (
         load_species_index,
+        fallback_species_index,
         build_entry_from_api,
+        get_species_attributes,
+        load_species_attributes_bulk,
     )
 except Exception:  # pragma: no cover - run as script
     from pokeapi_live import (
         load_species_index,
+        fallback_species_index,
         build_entry_from_api,
+        get_species_attributes,
+        load_species_attributes_bulk,
     )
 
+# pokeapi_live puts app/ on sys.path, so the shared util modules are importable here.
+from util.http import get_bytes
+from util.sampling import shuffled_order
+from util.text import pokemon_icon_url, titleize_slug
+
+BASE_PATH = Path(__file__).parent
 PAGE_SIZE = 8
 MAX_HISTORY = 64
+IO_WORKERS = 16
+MAX_RANDOM_POOLS = 8
+LOAD_FAILURE_BACKOFF_SECONDS = 60
+HISTORY_PLACEHOLDER = "__history_placeholder__"
+HISTORY_CLEAR = "__history_clear__"
 TWEMOJI_BASE = "https://cdnjs.cloudflare.com/ajax/libs/twemoji/14.0.2"
 FAVICON_MASK_COLOR = "#3b4cca"
 FAVICON_FILES: Sequence[Tuple[str, str | None, str | None, str]] = (
@@ -72,6 +91,33 @@ FAVICON_FILES: Sequence[Tuple[str, str | None, str | None, str]] = (
     ("apple-touch-icon", "image/png", "180x180", "apple-touch-icon.png"),
     ("mask-icon", None, None, "safari-pinned-tab.svg"),
 )
+FALLBACK_ICON_SVG = (
+    "<svg xmlns='http://www.w3.org/2000/svg' width='16' height='16'>"
+    "<rect width='16' height='16' fill='#ffde00'/>"
+    "</svg>"
+)
+PIXEL_ICON_B64 = base64.b64encode(FALLBACK_ICON_SVG.encode("utf-8")).decode("utf-8")
+FOOTER_TEMPLATE = """
+<div class="footer-bar">
+  <span>Crafted by Jaro Gee. Pokémon and Pokémon character names are trademarks of Nintendo, Creatures, and GAME FREAK.</span>
+  <span>All artwork (logos, background, sprites) © their respective owners and is used here in a non-commercial fan project.</span>
+  {powered_by}
+</div>
+"""
+FOOTER_POWERED_BY_LOGO = (
+    '<span class="footer-powered">Powered by '
+    '<img src="data:image/png;base64,{logo_b64}" alt="PokéAPI logo" /></span>'
+)
+FOOTER_POWERED_BY_TEXT = '<span class="footer-powered">Powered by PokéAPI</span>'
+POD_TEMPLATE = (
+    '<section class="pod-section"><div class="pod-grid">'
+    '<div class="pod-title">Pokémon of the Day</div>'
+    "{image}"
+    '<div class="pod-meta"><div class="pod-name">{name}</div><div class="pod-chips">{chips}</div></div>'
+    "</div></section>"
+)
+POD_IMAGE_TEMPLATE = '<div class="pod-image"><img src="{sprite}" alt="{name}"></div>'
+POD_IMAGE_EMPTY = '<div class="pod-image"></div>'
 
 COLOR_PALETTE: Dict[str, str] = {
     "red": "#ff0000",
@@ -102,6 +148,499 @@ TYPE_COLORS: Dict[str, str] = {
     "fairy": "#D685AD",
 }
 
+# Same output as html.escape(quote=True), but in a single C-level pass.
+_HTML_ESCAPE_TABLE = str.maketrans(
+    {"&": "&amp;", "<": "&lt;", ">": "&gt;", '"': "&quot;", "'": "&#x27;"}
+)
+
+
+_HTML_SPECIAL_RE = re.compile(r"[&<>\"']")
+
+
+def _esc(value: str) -> str:
+    # Most names and labels have nothing to escape; skip translate's copy for those.
+    if _HTML_SPECIAL_RE.search(value) is None:
+        return value
+    return value.translate(_HTML_ESCAPE_TABLE)
+
+
+def _build_app_css() -> str:
+    # Only called from the cached _render_page_css, so the sheet is formatted once per process.
+    return f"""
+<style>
+  :root {{
+    --poke-red: {COLOR_PALETTE["red"]};
+    --poke-dark-red: {COLOR_PALETTE["dark_red"]};
+    --poke-blue: {COLOR_PALETTE["blue"]};
+    --poke-yellow: {COLOR_PALETTE["yellow"]};
+    --poke-gold: {COLOR_PALETTE["gold"]};
+  }}
+  html, body, [data-testid="stAppRoot"], [data-testid="stAppViewContainer"],
+  [data-testid="stAppViewContainer"] > .main {{
+    background-color: #ffffff !important;
+    color: #000000 !important;
+    min-height: 100vh;
+    color-scheme: light !important;
+  }}
+  body, p, span, label, input, button, h1, h2, h3, h4, h5, h6,
+  .stMarkdown, .stTextInput {{
+    color: #000000 !important;
+  }}
+  .poke-card {{
+    background: rgba(255, 255, 255, 0.96);
+    border-radius: 20px;
+    border: 1px solid rgba(59, 76, 202, 0.15);
+    box-shadow: 0 12px 26px rgba(0, 0, 0, 0.08);
+    padding: 1.4rem;
+    margin-bottom: 1.25rem;
+  }}
+  .history-group {{
+    background: linear-gradient(135deg, rgba(59, 76, 202, 0.12), rgba(255, 222, 0, 0.16));
+    border: 1px solid rgba(59, 76, 202, 0.18);
+    border-radius: 24px;
+    padding: 1.35rem;
+    margin-bottom: 1.35rem;
+  }}
+  .history-header {{
+    display: flex;
+    justify-content: space-between;
+    flex-wrap: wrap;
+    gap: 0.75rem;
+    margin-bottom: 0.75rem;
+  }}
+  .history-header h3 {{
+    margin: 0;
+    color: var(--poke-blue);
+    font-size: 1.3rem;
+  }}
+  .history-meta {{
+    font-size: 0.9rem;
+    color: rgba(0, 0, 0, 0.65);
+  }}
+  .shortcut-row {{
+    display: flex;
+    gap: 0.4rem;
+    flex-wrap: wrap;
+    margin-bottom: 0.6rem;
+  }}
+  .shortcut-pill {{
+    display: inline-block;
+    padding: 0.2rem 0.6rem;
+    border-radius: 999px;
+    border: 1px solid rgba(0,0,0,0.22);
+    background: rgba(255,255,255,0.92);
+    font-size: 0.8rem;
+  }}
+  .card-header {{
+    display: flex;
+    justify-content: flex-start;
+    align-items: center;
+    gap: 1.2rem;
+  }}
+  .card-header .name {{
+    font-size: 1.2rem;
+    font-weight: 700;
+    color: var(--poke-blue);
+  }}
+  .card-header .meta {{
+    font-size: 0.9rem;
+    color: rgba(0, 0, 0, 0.65);
+  }}
+  .pixel-icon {{
+    height: 96px;
+    width: 96px;
+    object-fit: contain;
+    border-radius: 18px;
+    background: rgba(255,255,255,0.9);
+    border: 1px solid rgba(0,0,0,0.07);
+    padding: 0.5rem;
+    box-shadow: 0 6px 16px rgba(0,0,0,0.08);
+  }}
+  .section-grid {{
+    display: grid;
+    gap: 0.75rem;
+    grid-template-columns: repeat(auto-fill, minmax(210px, 1fr));
+    margin-top: 1rem;
+  }}
+  .entry-grid {{
+    display: grid;
+    gap: 0.9rem;
+    grid-template-columns: repeat(auto-fit, minmax(280px, 1fr));
+  }}
+  .section-block {{
+    background: rgba(255, 255, 255, 0.94);
+    border: 1px solid rgba(179, 161, 37, 0.28);
+    border-radius: 15px;
+    padding: 0.65rem 0.85rem;
+  }}
+  .section-title {{
+    margin: 0 0 0.45rem;
+    font-size: 0.9rem;
+    color: var(--poke-gold);
+    letter-spacing: 0.03em;
+    text-transform: uppercase;
+    font-weight: 600;
+  }}
+  .section-block ul {{
+    margin: 0;
+    padding-left: 1.15rem;
+    font-size: 0.9rem;
+  }}
+  .stButton>button {{
+    width: 100%;
+    border-radius: 14px;
+    font-weight: 700;
+    min-height: 48px;
+    letter-spacing: 0.01em;
+    transition: transform 0.2s ease;
+    background: #ffde00 !important;
+    color: #000000 !important;
+    border: 2px solid rgba(0,0,0,0.18) !important;
+    box-shadow: none !important;
+    white-space: nowrap;
+    min-width: 90px;
+  }}
+  button[aria-label="Search"]:hover, button[title="Search"]:hover,
+  button[aria-label="Random"]:hover, button[title="Random"]:hover {{
+    box-shadow: 0 16px 28px rgba(0, 0, 0, 0.25) !important;
+    transform: translateY(-1px);
+  }}
+  .stButton>button:disabled {{
+    opacity: 0.6;
+    box-shadow: none !important;
+    transform: none !important;
+  }}
+  [data-testid="stForm"] .stTextInput [aria-live=polite] {{
+    display: none !important;
+  }}
+  div[data-testid="stTextInputInstructions"],
+  [data-testid="stTextInputInstructions"],
+  .stTextInputInstructions,
+  div[data-testid="stTextInput"] label div:last-child,
+  div[data-testid="InputInstructions"],
+  .stTextInput div[data-testid="InputInstructions"] {{
+    display: none !important;
+  }}
+  .search-panel {{
+    padding: 1rem 1.25rem;
+    border-radius: 26px;
+    background: rgba(255,255,255,0.92);
+    border: 1px solid rgba(0,0,0,0.08);
+    margin-bottom: 1.25rem;
+  }}
+  .search-panel .section-label {{
+    font-size: 0.85rem;
+    text-transform: uppercase;
+    color: rgba(0,0,0,0.55);
+    letter-spacing: 0.08em;
+    margin-bottom: 0.35rem;
+    font-weight: 600;
+  }}
+  .search-panel input,
+  .search-panel select {{
+    border-radius: 22px;
+    border: 2px solid rgba(0,0,0,0.12);
+    min-height: 54px;
+    font-size: 1rem;
+  }}
+  [data-testid="stTextInput"] div[data-baseweb="input"],
+  [data-testid="stTextInput"] div[data-baseweb="input"] > div:first-child,
+  [data-testid="stTextInput"] div[data-baseweb="input"] input {{
+    background-color: #ffffff !important;
+    color: #111111 !important;
+    border-radius: 22px !important;
+    border: 2px solid rgba(17,17,17,0.18) !important;
+    color-scheme: light !important;
+    caret-color: #3b4cca !important;
+    box-shadow: none !important;
+  }}
+  [data-testid="stTextInput"] div[data-baseweb="input"]:focus-within {{
+    border-color: #3b4cca !important;
+    box-shadow: 0 0 0 2px rgba(59,76,202,0.2) !important;
+  }}
+  [data-testid="stTextInput"] input::placeholder {{
+    color: rgba(0,0,0,0.55) !important;
+  }}
+  body [data-testid="stAppViewContainer"] select {{
+    color-scheme: light;
+    background-color: #ffffff !important;
+    color: #111111 !important;
+    border: 2px solid rgba(17,17,17,0.22) !important;
+    border-radius: 22px !important;
+    min-height: 48px;
+    padding: 0.35rem 0.9rem;
+  }}
+  body [data-testid="stAppViewContainer"] select option,
+  body [data-testid="stAppViewContainer"] select optgroup {{
+    background-color: #ffffff !important;
+    color: #111111 !important;
+  }}
+  [data-testid="stSelectbox"] input {{
+    pointer-events: none !important;
+    caret-color: transparent !important;
+    color: transparent !important;
+    opacity: 0 !important;
+  }}
+  [data-testid="stSelectbox"] input::placeholder {{
+    color: transparent !important;
+  }}
+  [data-testid="stSelectbox"] div[data-baseweb="select"],
+  [data-testid="stSelectbox"] div[data-baseweb="select"] > div:first-child,
+  [data-testid="stSelectbox"] div[data-baseweb="select"] [role="combobox"] {{
+    background-color: #ffffff !important;
+    color: #111111 !important;
+    border-radius: 22px !important;
+    border: 2px solid rgba(17,17,17,0.18) !important;
+    caret-color: transparent !important;
+    color-scheme: light !important;
+  }}
+  [data-baseweb="layer"],
+  [data-baseweb="popover"] {{
+    background: transparent !important;
+    color-scheme: light !important;
+  }}
+  [data-baseweb="layer"] > div[data-baseweb="popover"],
+  div[data-baseweb="popover"],
+  div[data-baseweb="popover"] > div,
+  div[data-baseweb="popover"]::before,
+  div[data-baseweb="popover"]::after {{
+    background: #ffffff !important;
+    background-color: #ffffff !important;
+  }}
+  [data-baseweb="popover"] [role="listbox"],
+  [data-baseweb="select"] *,
+  [data-baseweb="popover"] [role="option"],
+  [data-baseweb="popover"] [data-baseweb="option"] {{
+    background: #ffffff !important;
+    background-color: #ffffff !important;
+    color: #111111 !important;
+    box-shadow: none !important;
+    filter: none !important;
+    mix-blend-mode: normal !important;
+    color-scheme: light !important;
+  }}
+  [data-baseweb="popover"] [role="option"],
+  [data-baseweb="popover"] [data-baseweb="option"],
+  [data-baseweb="popover"] [role="option"] > div,
+  [data-baseweb="popover"] [data-baseweb="option"] > div {{
+    background: #ffffff !important;
+    background-color: #ffffff !important;
+    color: #111111 !important;
+  }}
+  [data-baseweb="popover"] [role="option"][aria-selected="true"],
+  [data-baseweb="popover"] [data-baseweb="option"][aria-selected="true"] {{
+    background-color: #F2F2F2 !important;
+  }}
+  [data-baseweb="popover"] [role="option"][aria-selected="false"]:hover,
+  [data-baseweb="popover"] [data-baseweb="option"][aria-selected="false"]:hover {{
+    background-color: #F7F7F7 !important;
+  }}
+  div[data-baseweb="popover"] div[style*="overflow"],
+  div[data-baseweb="popover"] div[style*="overflow"]::before,
+  div[data-baseweb="popover"] div[style*="overflow"]::after {{
+    background: #ffffff !important;
+    background-color: #ffffff !important;
+    background-image: none !important;
+  }}
+  [data-baseweb="menu"],
+  [data-baseweb="menu"]::before,
+  [data-baseweb="menu"]::after,
+  [data-baseweb="menu"] * {{
+    background: #ffffff !important;
+    background-color: #ffffff !important;
+    color: #111111 !important;
+  }}
+  div[data-baseweb="popover"],
+  div[data-baseweb="popover"] [role="listbox"],
+  div[data-baseweb="select"] ul[role="listbox"] {{
+    background: #ffffff !important;
+    background-color: #ffffff !important;
+  }}
+  .search-panel .button-row {{
+    display: flex;
+    gap: 0.5rem;
+    margin-bottom: 0.75rem;
+    flex-wrap: wrap;
+  }}
+  .search-panel .button-row .stButton>button {{
+    min-width: 110px;
+  }}
+  div[aria-live="polite"],
+  div[role="status"] {{
+    display: none !important;
+  }}
+  .gallery-title {{
+    font-size: 1.15rem;
+    font-weight: 700;
+    margin-bottom: 0.15rem;
+  }}
+  .pod-divider {{
+    border-top: 2px solid #000000;
+    margin: 0.75rem 0 1.25rem;
+    width: 100%;
+  }}
+  .sprite-grid {{
+    display: grid;
+    grid-template-columns: repeat(4, minmax(0, 1fr));
+    gap: 0.75rem;
+  }}
+  .sprite-card {{
+    display: flex;
+    flex-direction: column;
+    align-items: center;
+    gap: 0.35rem;
+    padding: 0.55rem 0.4rem 0.9rem;
+    border-radius: 0.85rem;
+    background: rgba(255,255,255,0.88);
+    box-shadow: 0 8px 16px rgba(0,0,0,0.14);
+    text-decoration: none !important;
+  }}
+  .sprite-card img {{
+    width: 72px;
+    height: 72px;
+    display: block;
+  }}
+  .sprite-card div {{
+    font-weight: 700;
+    text-transform: capitalize;
+    color: #3b4cca;
+  }}
+  .meta-pill-grid {{
+    display: flex;
+    flex-wrap: wrap;
+    gap: 0.45rem;
+    margin-top: 0.75rem;
+  }}
+  .meta-pill {{
+    background: rgba(59, 76, 202, 0.08);
+    border: 1px solid rgba(59, 76, 202, 0.25);
+    border-radius: 18px;
+    padding: 0.35rem 0.9rem;
+    font-size: 0.85rem;
+    min-width: 110px;
+  }}
+  .meta-pill span {{
+    text-transform: uppercase;
+    font-size: 0.7rem;
+    color: rgba(0,0,0,0.55);
+    letter-spacing: 0.05em;
+  }}
+  .meta-pill strong {{
+    font-size: 0.95rem;
+    display: block;
+  }}
+  .evo-wrapper {{
+    margin-top: 1rem;
+    border-top: 1px solid rgba(0,0,0,0.08);
+    padding-top: 0.85rem;
+  }}
+  .evo-path {{
+    display: flex;
+    align-items: center;
+    gap: 0.45rem;
+    margin-bottom: 0.6rem;
+    flex-wrap: wrap;
+  }}
+  .evo-node {{
+    background: rgba(255,255,255,0.85);
+    border: 1px solid rgba(0,0,0,0.08);
+    border-radius: 12px;
+    padding: 0.45rem 0.55rem;
+    text-align: center;
+    min-width: 110px;
+  }}
+  .evo-node img {{
+    width: 52px;
+    height: 52px;
+    margin-bottom: 0.25rem;
+  }}
+  .evo-name {{
+    font-weight: 700;
+  }}
+  .evo-detail {{
+    font-size: 0.75rem;
+    color: rgba(0,0,0,0.6);
+  }}
+  .evo-arrow {{
+    font-size: 1.25rem;
+    color: rgba(0,0,0,0.4);
+  }}
+  .history-group h3,
+  .history-group h3 a,
+  .history-group h3 svg {{
+    display: none !important;
+  }}
+  .history-meta-badge {{
+    font-size: 0.85rem;
+    color: rgba(0,0,0,0.65);
+    margin-bottom: 0.55rem;
+    text-transform: uppercase;
+    letter-spacing: 0.08em;
+  }}
+  .footer-bar {{
+    margin-top: 3rem;
+    text-align: center;
+    font-size: 0.85rem;
+    color: rgba(0,0,0,0.65);
+    padding-bottom: 4rem;
+    display: flex;
+    flex-direction: column;
+    gap: 0.4rem;
+    align-items: center;
+  }}
+  .footer-powered {{
+    display: inline-flex;
+    align-items: center;
+    gap: 0.4rem;
+    font-weight: 600;
+    color: #3b4cca;
+  }}
+  .footer-powered img {{
+    width: 82px;
+    height: auto;
+    display: inline-block;
+  }}
+  .logo-wrapper {{
+    width: 100%;
+    text-align: center;
+    margin-bottom: 0.5rem;
+  }}
+  .logo-wrapper img {{
+    width: 100%;
+    height: auto;
+    display: block;
+    margin: 0 auto;
+  }}
+  [data-testid="stImage"] button,
+  [data-testid="stImage"] [data-testid="StyledFullScreenButton"],
+  button[title="View fullscreen"],
+  button[aria-label="View fullscreen"],
+  [data-testid="fullscreenButton"] {{
+    display: none !important;
+  }}
+
+  /* Hide Streamlit input hint like "Press Enter to submit" globally */
+  .stTextInput [aria-live=polite] {{
+    display: none !important;
+  }}
+  .main .block-container {{
+    padding-bottom: 7rem !important;
+  }}
+</style>
+"""
+
+PAGE_BACKGROUND_CSS = """
+<style>
+  [data-testid="stAppRoot"], [data-testid="stAppViewContainer"],
+  [data-testid="stAppViewContainer"] > .main, html, body {{
+    {bg_style}
+  }}
+  body, div, section {{
+    {cursor_style}
+  }}
+</style>
+"""
+
 
 def build_type_chips_html(types: Sequence[str] | None) -> str:
     spans: List[str] = []
@@ -109,7 +648,7 @@ def build_type_chips_html(types: Sequence[str] | None) -> str:
         label = str(t)
         color = TYPE_COLORS.get(label.lower(), "#777777")
         spans.append(
-            f'<span class="pod-chip" style="background-color:{color};">{html.escape(label.title())}</span>'
+            f'<span class="pod-chip" style="background-color:{color};">{_esc(label.title())}</span>'
         )
     return "".join(spans)
 
@@ -261,20 +800,17 @@ def render_pokemon_of_the_day(
     sprite_url: str | None,
     on_view_stats: Callable[[], None] | None = None,
 ) -> None:
-    safe_name = html.escape(name or "")
-    sprite_src = html.escape(sprite_url or "", quote=True)
+    safe_name = _esc(name or "")
+    sprite_src = _esc(sprite_url or "")
     chips_html = build_type_chips_html(types)
-    st.markdown('<section class="pod-section"><div class="pod-grid">', unsafe_allow_html=True)
-    st.markdown('<div class="pod-title">Pokémon of the Day</div>', unsafe_allow_html=True)
     image_markup = (
-        f'<div class="pod-image"><img src="{sprite_src}" alt="{safe_name}"></div>' if sprite_src else '<div class="pod-image"></div>'
+        POD_IMAGE_TEMPLATE.format(sprite=sprite_src, name=safe_name) if sprite_src else POD_IMAGE_EMPTY
     )
-    st.markdown(image_markup, unsafe_allow_html=True)
+    # One element, so .pod-grid actually wraps the title, image and meta blocks.
     st.markdown(
-        f'<div class="pod-meta"><div class="pod-name">{safe_name}</div><div class="pod-chips">{chips_html}</div></div>',
+        POD_TEMPLATE.format(image=image_markup, name=safe_name, chips=chips_html),
         unsafe_allow_html=True,
     )
-    st.markdown("</div></section>", unsafe_allow_html=True)
     c = st.container()
     with c:
         st.markdown('<div class="pod-actions">', unsafe_allow_html=True)
@@ -390,6 +926,14 @@ CAPTURE_BUCKETS: Dict[str, tuple[str, tuple[int, int] | None]] = {
     "tough": ("Tough (<50)", (0, 49)),
 }
 
+# Selectbox options, built once instead of list(dict.keys()) on every rerun.
+GENERATION_FILTER_KEYS = tuple(GENERATION_FILTERS)
+TYPE_FILTER_KEYS = tuple(TYPE_FILTERS)
+COLOR_FILTER_KEYS = tuple(COLOR_FILTERS)
+HABITAT_FILTER_KEYS = tuple(HABITAT_FILTERS)
+SHAPE_FILTER_KEYS = tuple(SHAPE_FILTERS)
+CAPTURE_FILTER_KEYS = tuple(CAPTURE_BUCKETS)
+
 
 GENERATION_SLUG_LABELS: Dict[str, str] = {
     "generation-i": "Generation I · Kanto",
@@ -404,25 +948,197 @@ GENERATION_SLUG_LABELS: Dict[str, str] = {
 }
 
 
-@st.cache_data(ttl=24 * 60 * 60)
-def pokemon_of_the_day(seed: str | None = None) -> Dict[str, object] | None:
-    index = load_species_index()
-    if not index:
-        return None
-    key = seed or datetime.utcnow().strftime("%Y-%m-%d")
-    rng = random.Random(key)
+def _fmt_generation(key: str) -> str:
+    return "Generation" if key == "all" else GENERATION_LABELS.get(key, key.title())
+
+
+def _fmt_type(key: str) -> str:
+    return "Type" if key == "all" else TYPE_LABELS.get(key, key.title())
+
+
+def _fmt_color(key: str) -> str:
+    return "Color" if key == "all" else key.replace("-", " ").title()
+
+
+def _fmt_habitat(key: str) -> str:
+    return "Habitat" if key == "all" else key.replace("-", " ").title()
+
+
+def _fmt_shape(key: str) -> str:
+    return "Body Shape" if key == "all" else key.replace("-", " ").title()
+
+
+def _fmt_capture(key: str) -> str:
+    return "Capture Rate" if key == "all" else CAPTURE_BUCKETS[key][0]
+
+
+def _utc_day_key() -> int:
+    # Proleptic ordinal of today's UTC date: a small int, no string formatting.
+    return datetime.now(timezone.utc).toordinal()
+
+
+# Callers pass the day key so the cache entry rolls over at UTC midnight
+# instead of living for a full TTL from whenever it was first computed.
+@st.cache_data(ttl=24 * 60 * 60, max_entries=2, show_spinner=False)
+def _load_pokemon_of_the_day(day_key: int) -> Dict[str, object]:
+    # Raises rather than returning None, so a failed pick is never cached for the day.
+    index = _live_species_records()
+    rng = random.Random(day_key)
     pick = rng.choice(index)
-    pid = int(pick.get("id", 0))
-    name = str(pick.get("name", ""))
+    pid = pick["id"]
+    name = pick["name"]
     entry = build_entry_from_api(pid, name)
     if not entry:
-        return None
-    sprite = entry.get("sprite") or _pokemon_icon_url(entry["name"], pid if pid else None)
+        raise LookupError(f"could not build the daily pick #{pid}")
+    sprite = entry.get("sprite") or pokemon_icon_url(entry["name"], pid if pid else None)
     types = entry.get("types") or []
     return {"id": pid, "name": entry["name"], "sprite": sprite, "types": types}
 
 
+def pokemon_of_the_day(day_key: int) -> Dict[str, object] | None:
+    if _recently_failed("pokemon_of_the_day"):
+        return None
+    try:
+        return _load_pokemon_of_the_day(day_key)
+    except Exception:
+        _mark_failed("pokemon_of_the_day")
+        return None
+
+
+class SpeciesRecord(TypedDict):
+    id: int
+    name: str
+
+
+_species_id = itemgetter("id")
+
+
+@st.cache_resource(show_spinner=False)
+def _load_failures() -> Dict[str, float]:
+    # Process-wide monotonic timestamps of recent failed loads, keyed by loader name.
+    return {}
+
+
+def _recently_failed(key: str) -> bool:
+    failed_at = _load_failures().get(key)
+    return failed_at is not None and time.monotonic() - failed_at < LOAD_FAILURE_BACKOFF_SECONDS
+
+
+def _mark_failed(key: str) -> None:
+    _load_failures()[key] = time.monotonic()
+
+
+def _coerce_species_records(raw: Sequence[Dict[str, object]]) -> List[SpeciesRecord]:
+    # Coerce once here so the filter/search loops can index record["id"] directly.
+    records: List[SpeciesRecord] = []
+    for record in raw:
+        pid = int(record.get("id", 0))
+        if pid:
+            records.append({"id": pid, "name": str(record.get("name", ""))})
+    records.sort(key=_species_id)
+    return records
+
+
+@st.cache_data(ttl=24 * 60 * 60, show_spinner=False)
+def _load_live_species_records() -> List[SpeciesRecord]:
+    records = _coerce_species_records(load_species_index(allow_fallback=False))
+    if not records:
+        # Raise rather than return, so an empty index is never cached.
+        raise LookupError("species index is empty")
+    return records
+
+
+def _live_species_records() -> List[SpeciesRecord]:
+    # During an outage, retry the fetch at most once per backoff window.
+    if _recently_failed("species_index"):
+        raise LookupError("species index recently unavailable")
+    try:
+        return _load_live_species_records()
+    except Exception:
+        _mark_failed("species_index")
+        raise
+
+
 @st.cache_data(show_spinner=False)
+def _fallback_species_records() -> List[SpeciesRecord]:
+    # The bundled dataset never changes, so caching it does not pin a transient failure.
+    return _coerce_species_records(fallback_species_index())
+
+
+def load_species_records() -> List[SpeciesRecord]:
+    try:
+        return _live_species_records()
+    except Exception:
+        return _fallback_species_records()
+
+
+def _build_species_lookup(
+    records: Sequence[SpeciesRecord],
+) -> Tuple[Dict[int, SpeciesRecord], Dict[int, str]]:
+    by_id: Dict[int, SpeciesRecord] = {}
+    name_lower: Dict[int, str] = {}
+    for record in records:
+        by_id[record["id"]] = record
+        name_lower[record["id"]] = record["name"].lower()
+    return by_id, name_lower
+
+
+@st.cache_resource(ttl=24 * 60 * 60, show_spinner=False)
+def _load_species_lookup() -> Tuple[Dict[int, SpeciesRecord], Dict[int, str]]:
+    # Read-only indexes shared by every session: id -> record and id -> lowercase name.
+    return _build_species_lookup(_live_species_records())
+
+
+def load_species_lookup() -> Tuple[Dict[int, SpeciesRecord], Dict[int, str]]:
+    try:
+        return _load_species_lookup()
+    except Exception:
+        # Live index unavailable: build from the small local dataset, uncached.
+        return _build_species_lookup(_fallback_species_records())
+
+
+def _build_species_name_haystack(
+    records: Sequence[SpeciesRecord],
+) -> Tuple[str, Tuple[int, ...], Tuple[SpeciesRecord, ...]]:
+    # Every lowercase name joined by newlines, with each name's start offset, so an
+    # unfiltered substring search is a few C-level str.find calls instead of a loop.
+    records = tuple(records)
+    names = [record["name"].lower() for record in records]
+    starts: List[int] = []
+    offset = 0
+    for name in names:
+        starts.append(offset)
+        offset += len(name) + 1
+    return "\n".join(names), tuple(starts), records
+
+
+@st.cache_resource(ttl=24 * 60 * 60, show_spinner=False)
+def _load_species_name_haystack() -> Tuple[str, Tuple[int, ...], Tuple[SpeciesRecord, ...]]:
+    return _build_species_name_haystack(_live_species_records())
+
+
+def load_species_name_haystack() -> Tuple[str, Tuple[int, ...], Tuple[SpeciesRecord, ...]]:
+    try:
+        return _load_species_name_haystack()
+    except Exception:
+        return _build_species_name_haystack(_fallback_species_records())
+
+
+def _search_species_names(needle: str) -> List[SpeciesRecord]:
+    haystack, starts, records = load_species_name_haystack()
+    matches: List[SpeciesRecord] = []
+    pos = haystack.find(needle)
+    while pos != -1:
+        idx = bisect_right(starts, pos) - 1
+        matches.append(records[idx])
+        if idx + 1 >= len(starts):
+            break
+        # Resume at the next name so each record is reported once, in id order.
+        pos = haystack.find(needle, starts[idx + 1])
+    return matches
+
+
+@st.cache_resource(show_spinner=False)
 def load_file_as_base64(path: Path) -> str | None:
     try:
         return base64.b64encode(path.read_bytes()).decode("utf-8")
@@ -460,41 +1176,39 @@ def resolve_asset_path(filename: str, base_path: Path | None = None) -> Path | N
     return None
 
 
+@st.cache_resource(show_spinner=False)
+def resolve_cached_asset_path(filename: str, base_path: Path | None = None) -> Path | None:
+    # Bundled assets don't move while the server runs; probe the search paths once.
+    return resolve_asset_path(filename, base_path)
+
+
+# Mutable defaults are factories so each session gets its own container.
+_STATE_DEFAULTS: Dict[str, object] = {
+    "history": functools.partial(deque, maxlen=MAX_HISTORY),
+    "search_query": "",
+    "generation_filter": "all",
+    "type_filter": "all",
+    "color_filter": "all",
+    "habitat_filter": "all",
+    "shape_filter": "all",
+    "capture_filter": "all",
+    "rand_pool_map": OrderedDict,
+    "search_prefill": "",
+    "search_query_input": "",
+    "search_feedback": "",
+    "pending_lookup_id": None,
+    "enter_submit": False,
+    "force_search_query": None,
+    "clear_request": False,
+}
+
+
 def ensure_state() -> None:
-    if "history" not in st.session_state:
-        st.session_state["history"] = []
-    if "search_query" not in st.session_state:
-        st.session_state["search_query"] = ""
-    if "generation_filter" not in st.session_state:
-        st.session_state["generation_filter"] = "all"
-    if "type_filter" not in st.session_state:
-        st.session_state["type_filter"] = "all"
-    if "color_filter" not in st.session_state:
-        st.session_state["color_filter"] = "all"
-    if "habitat_filter" not in st.session_state:
-        st.session_state["habitat_filter"] = "all"
-    if "shape_filter" not in st.session_state:
-        st.session_state["shape_filter"] = "all"
-    if "capture_filter" not in st.session_state:
-        st.session_state["capture_filter"] = "all"
-    if "rand_pool_map" not in st.session_state:
-        st.session_state["rand_pool_map"] = {}
-    if "search_prefill" not in st.session_state:
-        st.session_state["search_prefill"] = ""
-    if "search_query_input" not in st.session_state:
-        st.session_state["search_query_input"] = ""
-    if "search_feedback" not in st.session_state:
-        st.session_state["search_feedback"] = ""
-    if "species_attr_cache" not in st.session_state:
-        st.session_state["species_attr_cache"] = {}
-    if "pending_lookup_id" not in st.session_state:
-        st.session_state["pending_lookup_id"] = None
-    if "enter_submit" not in st.session_state:
-        st.session_state["enter_submit"] = False
-    if "force_search_query" not in st.session_state:
-        st.session_state["force_search_query"] = None
-    if "clear_request" not in st.session_state:
-        st.session_state["clear_request"] = False
+    state = st.session_state
+    # After the first run every key exists, so this set difference is empty.
+    for key in _STATE_DEFAULTS.keys() - state.keys():
+        default = _STATE_DEFAULTS[key]
+        state[key] = default() if callable(default) else default
 
 
 def _mark_enter_submit() -> None:
@@ -525,11 +1239,10 @@ def _twemoji_data_uri(codepoints: str, fmt: str) -> str | None:
         url = f"{TWEMOJI_BASE}/72x72/{codepoints}.png"
         mime = "image/png"
     try:
-        resp = requests.get(url, timeout=5)
-        resp.raise_for_status()
+        content = get_bytes(url, timeout=5)
     except Exception:
         return None
-    encoded = base64.b64encode(resp.content).decode("ascii")
+    encoded = base64.b64encode(content).decode("ascii")
     return f"data:{mime};base64,{encoded}"
 
 
@@ -631,7 +1344,7 @@ def _inject_head_links(tags: Sequence[Dict[str, str]]) -> None:
 def _build_static_favicon_tags(base_path: Path | None = None) -> List[Dict[str, str]]:
     tags: List[Dict[str, str]] = []
     for rel, mime, sizes, filename in FAVICON_FILES:
-        path = resolve_asset_path(filename, base_path)
+        path = resolve_cached_asset_path(filename, base_path)
         if not path:
             continue
         href = _file_data_uri(path)
@@ -684,24 +1397,38 @@ def _load_first_image_base64(paths: Sequence[Path]) -> tuple[str | None, str]:
     return None, "image/jpeg"
 
 
-def set_page_metadata() -> Dict[str, str]:
-    base_path = Path(__file__).parent
+@st.cache_resource(show_spinner=False)
+def load_pokeapi_logo(base_path: Path) -> str | None:
+    logo_path = base_path / "static" / "assets" / "pokeapi_256.png"
+    if not logo_path.exists():
+        logo_path = resolve_cached_asset_path("pokeapi_256.png", base_path)
+    if not logo_path or not logo_path.exists():
+        return None
+    return load_file_as_base64(logo_path)
 
-    st.set_page_config(
-        page_title="PokéSearch",
-        page_icon="⚡️",
-        layout="wide",
-        initial_sidebar_state="collapsed",
-    )
-    inject_brand_favicons(base_path, "⚡️")
 
-    candidates = asset_search_paths("pokesearch_bg.jpeg", base_path)
-    bg_image, bg_mime = _load_first_image_base64(candidates)
+def _static_url(path: Path | None) -> str | None:
+    # With server.enableStaticServing, files under ./static are served at app/static/.
+    if not path:
+        return None
+    try:
+        if not st.get_option("server.enableStaticServing"):
+            return None
+        rel = path.resolve().relative_to((BASE_PATH / "static").resolve())
+    except Exception:
+        return None
+    return f"app/static/{rel.as_posix()}"
+
+
+@st.cache_resource(show_spinner=False)
+def _render_page_css(bg_path: Path | None, bg_mtime_ns: int) -> str:
+    # bg_mtime_ns is only part of the cache key, so replacing the image rebuilds the CSS.
+    bg_url = _static_url(bg_path)
+    if not bg_url:
+        # Not servable as a static file: fall back to inlining it once per process.
+        bg_image, bg_mime = _load_first_image_base64([bg_path] if bg_path else [])
+        bg_url = f"data:{bg_mime};base64,{bg_image}" if bg_image else None
     cursor_image, cursor_mime = (None, "image/png")
-    pokeapi_logo_path = base_path / "static" / "assets" / "pokeapi_256.png"
-    if not pokeapi_logo_path.exists():
-        pokeapi_logo_path = resolve_asset_path("pokeapi_256.png", base_path)
-    pokeapi_logo = load_file_as_base64(pokeapi_logo_path) if pokeapi_logo_path and pokeapi_logo_path.exists() else None
     cursor_style = (
         f'cursor: url("data:{cursor_mime};base64,{cursor_image}") 16 16, auto !important;'
         if cursor_image
@@ -709,544 +1436,34 @@ def set_page_metadata() -> Dict[str, str]:
     )
     bg_style = (
         f'background: linear-gradient(rgba(255,255,255,0.55), rgba(255,255,255,0.8)), '
-        f'url("data:{bg_mime};base64,{bg_image}") !important;\n'
+        f'url("{bg_url}") !important;\n'
         "background-size: cover !important;\n"
         "background-position: center !important;\n"
         "background-repeat: no-repeat !important;\n"
         "background-attachment: fixed !important;\n"
-        if bg_image
+        if bg_url
         else ""
     )
-    colors = COLOR_PALETTE
-    custom_css = f"""
-    <style>
-      :root {{
-        --poke-red: {colors["red"]};
-        --poke-dark-red: {colors["dark_red"]};
-        --poke-blue: {colors["blue"]};
-        --poke-yellow: {colors["yellow"]};
-
-        
-        --poke-gold: {colors["gold"]};
-      }}
-      html, body, [data-testid="stAppRoot"], [data-testid="stAppViewContainer"],
-      [data-testid="stAppViewContainer"] > .main {{
-        background-color: #ffffff !important;
-        color: #000000 !important;
-        min-height: 100vh;
-        color-scheme: light !important;
-      }}
-      [data-testid="stAppRoot"], [data-testid="stAppViewContainer"],
-      [data-testid="stAppViewContainer"] > .main, html, body {{
-        {bg_style}
-      }}
-      body, p, span, label, input, button, h1, h2, h3, h4, h5, h6,
-      .stMarkdown, .stTextInput {{
-        color: #000000 !important;
-      }}
-      body, div, section {{
-        {cursor_style}
-      }}
-      .poke-card {{
-        background: rgba(255, 255, 255, 0.96);
-        border-radius: 20px;
-        border: 1px solid rgba(59, 76, 202, 0.15);
-        box-shadow: 0 12px 26px rgba(0, 0, 0, 0.08);
-        padding: 1.4rem;
-        margin-bottom: 1.25rem;
-      }}
-      .history-group {{
-        background: linear-gradient(135deg, rgba(59, 76, 202, 0.12), rgba(255, 222, 0, 0.16));
-        border: 1px solid rgba(59, 76, 202, 0.18);
-        border-radius: 24px;
-        padding: 1.35rem;
-        margin-bottom: 1.35rem;
-      }}
-      .history-header {{
-        display: flex;
-        justify-content: space-between;
-        flex-wrap: wrap;
-        gap: 0.75rem;
-        margin-bottom: 0.75rem;
-      }}
-      .history-header h3 {{
-        margin: 0;
-        color: var(--poke-blue);
-        font-size: 1.3rem;
-      }}
-      .history-meta {{
-        font-size: 0.9rem;
-        color: rgba(0, 0, 0, 0.65);
-      }}
-      .shortcut-row {{
-        display: flex;
-        gap: 0.4rem;
-        flex-wrap: wrap;
-        margin-bottom: 0.6rem;
-      }}
-      .shortcut-pill {{
-        display: inline-block;
-        padding: 0.2rem 0.6rem;
-        border-radius: 999px;
-        border: 1px solid rgba(0,0,0,0.22);
-        background: rgba(255,255,255,0.92);
-        font-size: 0.8rem;
-      }}
-      .card-header {{
-        display: flex;
-        justify-content: flex-start;
-        align-items: center;
-        gap: 1.2rem;
-      }}
-      .card-header .name {{
-        font-size: 1.2rem;
-        font-weight: 700;
-        color: var(--poke-blue);
-      }}
-      .card-header .meta {{
-        font-size: 0.9rem;
-        color: rgba(0, 0, 0, 0.65);
-      }}
-      .pixel-icon {{
-        height: 96px;
-        width: 96px;
-        object-fit: contain;
-        border-radius: 18px;
-        background: rgba(255,255,255,0.9);
-        border: 1px solid rgba(0,0,0,0.07);
-        padding: 0.5rem;
-        box-shadow: 0 6px 16px rgba(0,0,0,0.08);
-      }}
-      .section-grid {{
-        display: grid;
-        gap: 0.75rem;
-        grid-template-columns: repeat(auto-fill, minmax(210px, 1fr));
-        margin-top: 1rem;
-      }}
-      .entry-grid {{
-        display: grid;
-        gap: 0.9rem;
-        grid-template-columns: repeat(auto-fit, minmax(280px, 1fr));
-      }}
-      .section-block {{
-        background: rgba(255, 255, 255, 0.94);
-        border: 1px solid rgba(179, 161, 37, 0.28);
-        border-radius: 15px;
-        padding: 0.65rem 0.85rem;
-      }}
-      .section-title {{
-        margin: 0 0 0.45rem;
-        font-size: 0.9rem;
-        color: var(--poke-gold);
-        letter-spacing: 0.03em;
-        text-transform: uppercase;
-        font-weight: 600;
-      }}
-      .section-block ul {{
-        margin: 0;
-        padding-left: 1.15rem;
-        font-size: 0.9rem;
-      }}
-      .stButton>button {{
-        width: 100%;
-        border-radius: 14px;
-        font-weight: 700;
-        min-height: 48px;
-        letter-spacing: 0.01em;
-        transition: transform 0.2s ease;
-        background: #ffde00 !important;
-        color: #000000 !important;
-        border: 2px solid rgba(0,0,0,0.18) !important;
-        box-shadow: none !important;
-        white-space: nowrap;
-        min-width: 90px;
-      }}
-      button[aria-label="Search"]:hover, button[title="Search"]:hover,
-      button[aria-label="Random"]:hover, button[title="Random"]:hover {{
-        box-shadow: 0 16px 28px rgba(0, 0, 0, 0.25) !important;
-        transform: translateY(-1px);
-      }}
-      .stButton>button:disabled {{
-        opacity: 0.6;
-        box-shadow: none !important;
-        transform: none !important;
-      }}
-      [data-testid="stForm"] .stTextInput [aria-live=polite] {{
-        display: none !important;
-      }}
-      div[data-testid="stTextInputInstructions"],
-      [data-testid="stTextInputInstructions"],
-      .stTextInputInstructions,
-      div[data-testid="stTextInput"] label div:last-child,
-      div[data-testid="InputInstructions"],
-      .stTextInput div[data-testid="InputInstructions"] {{
-        display: none !important;
-      }}
-      .search-panel {{
-        padding: 1rem 1.25rem;
-        border-radius: 26px;
-        background: rgba(255,255,255,0.92);
-        border: 1px solid rgba(0,0,0,0.08);
-        margin-bottom: 1.25rem;
-      }}
-      .search-panel .section-label {{
-        font-size: 0.85rem;
-        text-transform: uppercase;
-        color: rgba(0,0,0,0.55);
-        letter-spacing: 0.08em;
-        margin-bottom: 0.35rem;
-        font-weight: 600;
-      }}
-      .search-panel input,
-      .search-panel select {{
-        border-radius: 22px;
-        border: 2px solid rgba(0,0,0,0.12);
-        min-height: 54px;
-        font-size: 1rem;
-      }}
-      [data-testid="stTextInput"] div[data-baseweb="input"],
-      [data-testid="stTextInput"] div[data-baseweb="input"] > div:first-child,
-      [data-testid="stTextInput"] div[data-baseweb="input"] input {{
-        background-color: #ffffff !important;
-        color: #111111 !important;
-        border-radius: 22px !important;
-        border: 2px solid rgba(17,17,17,0.18) !important;
-        color-scheme: light !important;
-        caret-color: #3b4cca !important;
-        box-shadow: none !important;
-      }}
-      [data-testid="stTextInput"] div[data-baseweb="input"]:focus-within {{
-        border-color: #3b4cca !important;
-        box-shadow: 0 0 0 2px rgba(59,76,202,0.2) !important;
-      }}
-      [data-testid="stTextInput"] input::placeholder {{
-        color: rgba(0,0,0,0.55) !important;
-      }}
-      body [data-testid="stAppViewContainer"] select {{
-        color-scheme: light;
-        background-color: #ffffff !important;
-        color: #111111 !important;
-        border: 2px solid rgba(17,17,17,0.22) !important;
-        border-radius: 22px !important;
-        min-height: 48px;
-        padding: 0.35rem 0.9rem;
-      }}
-      body [data-testid="stAppViewContainer"] select option,
-      body [data-testid="stAppViewContainer"] select optgroup {{
-        background-color: #ffffff !important;
-        color: #111111 !important;
-      }}
-      [data-testid="stSelectbox"] input {{
-        pointer-events: none !important;
-        caret-color: transparent !important;
-        color: transparent !important;
-        opacity: 0 !important;
-      }}
-      [data-testid="stSelectbox"] input::placeholder {{
-        color: transparent !important;
-      }}
-      [data-testid="stSelectbox"] div[data-baseweb="select"],
-      [data-testid="stSelectbox"] div[data-baseweb="select"] > div:first-child,
-      [data-testid="stSelectbox"] div[data-baseweb="select"] [role="combobox"] {{
-        background-color: #ffffff !important;
-        color: #111111 !important;
-        border-radius: 22px !important;
-        border: 2px solid rgba(17,17,17,0.18) !important;
-        caret-color: transparent !important;
-        color-scheme: light !important;
-      }}
-      [data-baseweb="layer"],
-      [data-baseweb="popover"] {{
-        background: transparent !important;
-        color-scheme: light !important;
-      }}
-      [data-baseweb="layer"] > div[data-baseweb="popover"],
-      div[data-baseweb="popover"],
-      div[data-baseweb="popover"] > div,
-      div[data-baseweb="popover"]::before,
-      div[data-baseweb="popover"]::after {{
-        background: #ffffff !important;
-        background-color: #ffffff !important;
-      }}
-      [data-baseweb="popover"] [role="listbox"],
-      [data-baseweb="select"] *,
-      [data-baseweb="popover"] [role="option"],
-      [data-baseweb="popover"] [data-baseweb="option"] {{
-        background: #ffffff !important;
-        background-color: #ffffff !important;
-        color: #111111 !important;
-        box-shadow: none !important;
-        filter: none !important;
-        mix-blend-mode: normal !important;
-        color-scheme: light !important;
-      }}
-      [data-baseweb="popover"] [role="option"],
-      [data-baseweb="popover"] [data-baseweb="option"],
-      [data-baseweb="popover"] [role="option"] > div,
-      [data-baseweb="popover"] [data-baseweb="option"] > div {{
-        background: #ffffff !important;
-        background-color: #ffffff !important;
-        color: #111111 !important;
-      }}
-      [data-baseweb="popover"] [role="option"][aria-selected="true"],
-      [data-baseweb="popover"] [data-baseweb="option"][aria-selected="true"] {{
-        background-color: #F2F2F2 !important;
-      }}
-      [data-baseweb="popover"] [role="option"][aria-selected="false"]:hover,
-      [data-baseweb="popover"] [data-baseweb="option"][aria-selected="false"]:hover {{
-        background-color: #F7F7F7 !important;
-      }}
-      div[data-baseweb="popover"] div[style*="overflow"],
-      div[data-baseweb="popover"] div[style*="overflow"]::before,
-      div[data-baseweb="popover"] div[style*="overflow"]::after {{
-        background: #ffffff !important;
-        background-color: #ffffff !important;
-        background-image: none !important;
-      }}
-      [data-baseweb="menu"],
-      [data-baseweb="menu"]::before,
-      [data-baseweb="menu"]::after,
-      [data-baseweb="menu"] * {{
-        background: #ffffff !important;
-        background-color: #ffffff !important;
-        color: #111111 !important;
-      }}
-      div[data-baseweb="popover"],
-      div[data-baseweb="popover"] [role="listbox"],
-      div[data-baseweb="select"] ul[role="listbox"] {{
-        background: #ffffff !important;
-        background-color: #ffffff !important;
-      }}
-      .search-panel .button-row {{
-        display: flex;
-        gap: 0.5rem;
-        margin-bottom: 0.75rem;
-        flex-wrap: wrap;
-      }}
-      .search-panel .button-row .stButton>button {{
-        min-width: 110px;
-      }}
-      div[aria-live="polite"],
-      div[role="status"] {{
-        display: none !important;
-      }}
-      .gallery-title {{
-        font-size: 1.15rem;
-        font-weight: 700;
-        margin-bottom: 0.15rem;
-      }}
-      .pod-divider {{
-        border-top: 2px solid #000000;
-        margin: 0.75rem 0 1.25rem;
-        width: 100%;
-      }}
-      .pixel-icon {{
-        border-radius: 18px;
-      }}
-      .sprite-card {{
-        display: flex;
-        flex-direction: column;
-        align-items: center;
-        gap: 0.35rem;
-        padding: 0.55rem 0.4rem 0.9rem;
-        border-radius: 0.85rem;
-        background: rgba(255,255,255,0.88);
-        box-shadow: 0 8px 16px rgba(0,0,0,0.14);
-        text-decoration: none !important;
-      }}
-      .sprite-card img {{
-        width: 72px;
-        height: 72px;
-        display: block;
-      }}
-      .sprite-card div {{
-        font-weight: 700;
-        text-transform: capitalize;
-        color: #3b4cca;
-      }}
-      .meta-pill-grid {{
-        display: flex;
-        flex-wrap: wrap;
-        gap: 0.45rem;
-        margin-top: 0.75rem;
-      }}
-      .meta-pill {{
-        background: rgba(59, 76, 202, 0.08);
-        border: 1px solid rgba(59, 76, 202, 0.25);
-        border-radius: 18px;
-        padding: 0.35rem 0.9rem;
-        font-size: 0.85rem;
-        min-width: 110px;
-      }}
-      .meta-pill span {{
-        text-transform: uppercase;
-        font-size: 0.7rem;
-        color: rgba(0,0,0,0.55);
-        letter-spacing: 0.05em;
-      }}
-      .meta-pill strong {{
-        font-size: 0.95rem;
-        display: block;
-      }}
-      .evo-wrapper {{
-        margin-top: 1rem;
-        border-top: 1px solid rgba(0,0,0,0.08);
-        padding-top: 0.85rem;
-      }}
-      .evo-path {{
-        display: flex;
-        align-items: center;
-        gap: 0.45rem;
-        margin-bottom: 0.6rem;
-        flex-wrap: wrap;
-      }}
-      .evo-node {{
-        background: rgba(255,255,255,0.85);
-        border: 1px solid rgba(0,0,0,0.08);
-        border-radius: 12px;
-        padding: 0.45rem 0.55rem;
-        text-align: center;
-        min-width: 110px;
-      }}
-      .evo-node img {{
-        width: 52px;
-        height: 52px;
-        margin-bottom: 0.25rem;
-      }}
-      .evo-name {{
-        font-weight: 700;
-      }}
-      .evo-detail {{
-        font-size: 0.75rem;
-        color: rgba(0,0,0,0.6);
-      }}
-      .evo-arrow {{
-        font-size: 1.25rem;
-        color: rgba(0,0,0,0.4);
-      }}
-      .meta-pill-grid {{
-        display: flex;
-        flex-wrap: wrap;
-        gap: 0.45rem;
-        margin-top: 0.75rem;
-      }}
-      .meta-pill {{
-        background: rgba(59, 76, 202, 0.08);
-        border: 1px solid rgba(59, 76, 202, 0.25);
-        border-radius: 18px;
-        padding: 0.35rem 0.9rem;
-        font-size: 0.85rem;
-        min-width: 110px;
-      }}
-      .meta-pill span {{
-        text-transform: uppercase;
-        font-size: 0.7rem;
-        color: rgba(0,0,0,0.55);
-        letter-spacing: 0.05em;
-      }}
-      .meta-pill strong {{
-        font-size: 0.95rem;
-        display: block;
-      }}
-      .evo-wrapper {{
-        margin-top: 1rem;
-        border-top: 1px solid rgba(0,0,0,0.08);
-        padding-top: 0.85rem;
-      }}
-      .evo-path {{
-        display: flex;
-        align-items: center;
-        gap: 0.45rem;
-        margin-bottom: 0.6rem;
-      }}
-      .evo-node {{
-        background: rgba(255,255,255,0.85);
-        border: 1px solid rgba(0,0,0,0.08);
-        border-radius: 12px;
-        padding: 0.45rem 0.55rem;
-        text-align: center;
-        min-width: 110px;
-      }}
-      .evo-node img {{
-        width: 52px;
-        height: 52px;
-        margin-bottom: 0.25rem;
-      }}
-      .evo-name {{
-        font-weight: 700;
-      }}
-      .evo-detail {{
-        font-size: 0.75rem;
-        color: rgba(0,0,0,0.6);
-      }}
-      .evo-arrow {{
-        font-size: 1.25rem;
-        color: rgba(0,0,0,0.4);
-      }}
-      .history-group h3,
-      .history-group h3 a,
-      .history-group h3 svg {{
-        display: none !important;
-      }}
-      .history-meta-badge {{
-        font-size: 0.85rem;
-        color: rgba(0,0,0,0.65);
-        margin-bottom: 0.55rem;
-        text-transform: uppercase;
-        letter-spacing: 0.08em;
-      }}
-      .footer-bar {{
-        margin-top: 3rem;
-        text-align: center;
-        font-size: 0.85rem;
-        color: rgba(0,0,0,0.65);
-        padding-bottom: 4rem;
-        display: flex;
-        flex-direction: column;
-        gap: 0.4rem;
-        align-items: center;
-      }}
-      .footer-powered {{
-        display: inline-flex;
-        align-items: center;
-        gap: 0.4rem;
-        font-weight: 600;
-        color: #3b4cca;
-      }}
-      .footer-powered img {{
-        width: 82px;
-        height: auto;
-        display: inline-block;
-      }}
-      .logo-wrapper {{
-        width: 100%;
-        text-align: center;
-        margin-bottom: 0.5rem;
-      }}
-      .logo-wrapper img {{
-        width: 100%;
-        height: auto;
-        display: block;
-        margin: 0 auto;
-      }}
-      [data-testid="stImage"] button,
-      [data-testid="stImage"] [data-testid="StyledFullScreenButton"],
-      button[title="View fullscreen"],
-      button[aria-label="View fullscreen"],
-      [data-testid="fullscreenButton"] {{
-        display: none !important;
-      }}
+    return _build_app_css() + PAGE_BACKGROUND_CSS.format(bg_style=bg_style, cursor_style=cursor_style)
 
-      /* Hide Streamlit input hint like "Press Enter to submit" globally */
-      .stTextInput [aria-live=polite] {{
-        display: none !important;
-      }}
-      .main .block-container {{
-        padding-bottom: 7rem !important;
-      }}
-    </style>
-    """
-    st.markdown(custom_css, unsafe_allow_html=True)
+
+def set_page_metadata() -> Dict[str, str]:
+    st.set_page_config(
+        page_title="PokéSearch",
+        page_icon="⚡️",
+        layout="wide",
+        initial_sidebar_state="collapsed",
+    )
+    inject_brand_favicons(BASE_PATH, "⚡️")
+
+    bg_path = resolve_cached_asset_path("pokesearch_bg.jpeg", BASE_PATH)
+    try:
+        bg_mtime_ns = bg_path.stat().st_mtime_ns if bg_path else 0
+    except OSError:
+        bg_mtime_ns = 0
+    pokeapi_logo = load_pokeapi_logo(BASE_PATH)
+    # Still emitted every run: Streamlit drops elements a rerun does not re-emit.
+    st.markdown(_render_page_css(bg_path, bg_mtime_ns), unsafe_allow_html=True)
     inject_pod_css()
     return {"pokeapi_logo": pokeapi_logo}
 
@@ -1261,137 +1478,267 @@ def make_history_entry(
     return {
         "label": label,
         "query": query_display,
-        "entries": list(entries),
+        "entries": [entry for entry in entries if isinstance(entry, dict)],
         "meta": meta_label,
         "shortcuts": list(shortcuts),
-        "timestamp": datetime.now(),
+        # Epoch seconds; format with datetime.fromtimestamp() only if shown.
+        "timestamp": time.time(),
     }
 
 
 def add_to_history(entry: Dict[str, object]) -> None:
-    st.session_state.history.insert(0, entry)
-    if len(st.session_state.history) > MAX_HISTORY:
-        st.session_state.history = st.session_state.history[:MAX_HISTORY]
+    # The only writer: history holds nothing but make_history_entry dicts, so readers
+    # can use it directly.
+    if not isinstance(entry, dict):
+        return
+    history = st.session_state.history
+    if not isinstance(history, deque):
+        history = st.session_state.history = deque(
+            (group for group in history if isinstance(group, dict)), maxlen=MAX_HISTORY
+        )
+    history.appendleft(entry)
+
+
+# Options are history indexes plus the two string sentinels.
+def _history_options(
+    history_entries: Sequence[Dict[str, object]],
+) -> Tuple[List[int | str], Dict[int | str, str]]:
+    fingerprint = (
+        len(history_entries),
+        tuple((entry.get("query"), entry.get("label")) for entry in history_entries),
+    )
+    cached = st.session_state.get("_history_options")
+    if cached is not None and st.session_state.get("_history_fingerprint") == fingerprint:
+        return cached
+    history_tokens: List[int | str] = [HISTORY_PLACEHOLDER]
+    if history_entries:
+        history_labels: Dict[int | str, str] = {HISTORY_PLACEHOLDER: ""}
+    else:
+        history_labels = {HISTORY_PLACEHOLDER: "(no history)"}
+    for idx, entry_group in enumerate(history_entries):
+        display_query = entry_group.get("query") or entry_group.get("label") or "Past search"
+        history_tokens.append(idx)
+        history_labels[idx] = f"{idx + 1}. {display_query}"
+    if history_entries:
+        history_tokens.append(HISTORY_CLEAR)
+        history_labels[HISTORY_CLEAR] = "Clear history"
+    st.session_state["_history_fingerprint"] = fingerprint
+    st.session_state["_history_options"] = (history_tokens, history_labels)
+    return history_tokens, history_labels
 
 
 def render_section(section: Dict[str, object]) -> str:
-    items_html = "".join(f"<li>{html.escape(item)}</li>" for item in section["items"])
+    items = section["items"]
+    # Escape all items in one pass; escaping never emits NUL, so it is a safe separator.
+    escaped = _esc("\x00".join(items)).replace("\x00", "</li><li>")
+    items_html = f"<li>{escaped}</li>" if items else ""
     return (
         '<div class="section-block">'
-        f'<div class="section-title">{html.escape(section["title"])}</div>'
+        f'<div class="section-title">{_esc(section["title"])}</div>'
         f"<ul>{items_html}</ul>"
         "</div>"
     )
 
 
-def _slugify_pokemon_name(name: str) -> str:
-    # Handle gendered names before normalisation
-    name = name.replace("♀", " f").replace("♂", " m")
-    # Normalize unicode (e.g., é -> e) then keep [a-z0-9-]
-    normalized = (
-        unicodedata.normalize("NFKD", name)
-        .encode("ascii", "ignore")
-        .decode("ascii")
-        .lower()
-    )
-    slug = re.sub(r"[^a-z0-9]+", "-", normalized).strip("-")
-    return slug
-
-
-def _pokemon_icon_url(name: str, pid: int | None = None) -> str:
-    if pid:
-        return f"https://raw.githubusercontent.com/PokeAPI/sprites/master/sprites/pokemon/{pid}.png"
-    slug = _slugify_pokemon_name(name)
-    return f"https://img.pokemondb.net/sprites/sword-shield/icon/{slug}.png"
-
-
 def _filter_species_by_generation(
-    species: List[Dict[str, object]], generation_key: str
-) -> List[Dict[str, object]]:
+    species: List[SpeciesRecord], generation_key: str
+) -> List[SpeciesRecord]:
     bounds = GENERATION_FILTERS.get(generation_key)
     if not bounds:
         return species
     low, high = bounds
-    return [s for s in species if low <= int(s.get("id", 0)) <= high]
+    # Records are sorted by id, so a generation is one contiguous slice.
+    start = bisect_left(species, low, key=_species_id)
+    end = bisect_right(species, high, key=_species_id)
+    return species[start:end]
 
 
-def _filter_species_by_type(
-    species: List[Dict[str, object]], type_key: str
-) -> List[Dict[str, object]]:
-    if type_key == "all":
-        return species
+@st.cache_resource(ttl=24 * 60 * 60, show_spinner=False)
+def _load_type_id_set(type_key: str) -> FrozenSet[int]:
+    # Parsed once per process instead of re-reading the type's JSON on every filter run.
     try:
         from pokeapi_live import load_type_index as _load_type_index  # type: ignore
     except Exception:
-        try:
-            from .pokeapi_live import load_type_index as _load_type_index  # type: ignore
-        except Exception:
-            return species
+        from .pokeapi_live import load_type_index as _load_type_index  # type: ignore
+    allowed_ids = frozenset(_load_type_index(type_key))
+    if not allowed_ids:
+        # Raise rather than return, so cache_resource never pins an empty set.
+        raise LookupError(f"no type index for {type_key!r}")
+    return allowed_ids
+
+
+def _type_id_set(type_key: str) -> FrozenSet[int] | None:
+    # None means "no constraint": "all", or a type index that could not be loaded.
+    if type_key == "all":
+        return None
     try:
-        allowed_ids = set(_load_type_index(type_key))
+        return _load_type_id_set(type_key)
     except Exception:
+        return None
+
+
+def _filter_species_by_type(
+    species: List[SpeciesRecord], type_key: str
+) -> List[SpeciesRecord]:
+    allowed_ids = _type_id_set(type_key)
+    if allowed_ids is None:
         return species
-    if not allowed_ids:
-        return species
-    return [s for s in species if int(s.get("id", 0)) in allowed_ids]
+    return [s for s in species if s["id"] in allowed_ids]
+
+
+@st.cache_resource(show_spinner=False)
+def _io_executor() -> ThreadPoolExecutor:
+    # One long-lived pool for all sessions instead of spawning threads per rerun.
+    # Jobs submitted here must not submit back into it (pokeapi_live has its own pool).
+    return ThreadPoolExecutor(max_workers=IO_WORKERS, thread_name_prefix="pokedex-io")
+
+
+_INDEXED_ATTRIBUTES = ("color", "habitat", "shape")
+_CAPTURE_BOUNDS = tuple(bounds for _, bounds in CAPTURE_BUCKETS.values() if bounds)
+
+
+@st.cache_resource(ttl=24 * 60 * 60, show_spinner=False)
+def load_species_attribute_index() -> Dict[str, Dict[object, FrozenSet[int]]]:
+    # Inverted index {field: {value: ids}} over every species, shared by all sessions.
+    ids = tuple(record["id"] for record in _live_species_records())
+    table = dict(load_species_attributes_bulk(ids))
+    missing = [pid for pid in ids if pid not in table]
+    if missing:
+        # Bulk query unavailable or partial: fill the gaps from the per-species disk cache.
+        table.update(zip(missing, _io_executor().map(get_species_attributes, missing)))
+    # Every species has a color, so a blank one means its lookup failed.
+    if not ids or any(not table[pid].get("color") for pid in ids):
+        # Raise rather than return, so cache_resource never pins a partial index.
+        raise LookupError("species attribute table is incomplete")
+    index: Dict[str, Dict[object, Set[int]]] = {field: {} for field in _INDEXED_ATTRIBUTES}
+    # Capture buckets are keyed by their (low, high) bounds, so a bucket filter is one lookup.
+    index["capture_bucket"] = {bounds: set() for bounds in _CAPTURE_BOUNDS}
+    for pid, attrs in table.items():
+        for field in _INDEXED_ATTRIBUTES:
+            index[field].setdefault(attrs.get(field), set()).add(pid)
+        capture_rate = attrs.get("capture_rate")
+        if isinstance(capture_rate, int):
+            for low, high in _CAPTURE_BOUNDS:
+                if low <= capture_rate <= high:
+                    index["capture_bucket"][(low, high)].add(pid)
+    return {
+        field: {value: frozenset(pids) for value, pids in values.items()}
+        for field, values in index.items()
+    }
 
 
-def _load_species_attributes(pokemon_id: int) -> Dict[str, object]:
-    cache: Dict[int, Dict[str, object]] = st.session_state.setdefault("species_attr_cache", {})
-    if pokemon_id in cache:
-        return cache[pokemon_id]
+def _indexed_filter_ids(
+    targets: Sequence[Tuple[str, str]], bucket: Tuple[int, int] | None
+) -> Set[int]:
+    # Raises while the index is unavailable. A failed build is not cached, so back off
+    # rather than rerun the bulk query on every click.
+    if _recently_failed("attribute_index"):
+        raise LookupError("species attribute index recently unavailable")
     try:
-        from pokeapi_live import get_species_attributes as _get_species_attributes  # type: ignore
+        index = load_species_attribute_index()
     except Exception:
-        from .pokeapi_live import get_species_attributes as _get_species_attributes  # type: ignore
-    attrs = _get_species_attributes(pokemon_id) or {}
-    cache[pokemon_id] = attrs
-    return attrs
-
-
-def _apply_additional_filters(
-    species: List[Dict[str, object]],
-    color_key: str,
-    habitat_key: str,
-    shape_key: str,
-    capture_key: str,
-) -> List[Dict[str, object]]:
-    result = []
+        _mark_failed("attribute_index")
+        raise
+    allowed: Set[int] | None = None
+    for field, target in targets:
+        ids = index[field].get(target, frozenset())
+        allowed = set(ids) if allowed is None else allowed & ids
+    if bucket:
+        in_bucket = index["capture_bucket"].get(tuple(bucket), frozenset())
+        allowed = set(in_bucket) if allowed is None else allowed & in_bucket
+    return allowed
+
+
+def _resolve_attribute_targets(
+    color_key: str, habitat_key: str, shape_key: str, capture_key: str
+) -> Tuple[List[Tuple[str, str]], Tuple[int, int] | None] | None:
+    # Returns (field targets, capture bounds); None when a key is unknown and so matches nothing.
     bucket = CAPTURE_BUCKETS.get(capture_key, ("Any", None))[1]
-    for record in species:
-        pid = int(record.get("id", 0))
-        attrs = _load_species_attributes(pid)
-        color_val = str(attrs.get("color", "") or "").lower()
-        habitat_val = str(attrs.get("habitat", "") or "").lower()
-        shape_val = str(attrs.get("shape", "") or "").lower()
-        capture_rate = attrs.get("capture_rate")
+    targets: List[Tuple[str, str]] = []
+    for field, key, choices in (
+        ("color", color_key, COLOR_FILTERS),
+        ("habitat", habitat_key, HABITAT_FILTERS),
+        ("shape", shape_key, SHAPE_FILTERS),
+    ):
+        if key == "all":
+            continue
+        target = choices.get(key)
+        if not target:
+            return None
+        targets.append((field, target))
+    return targets, bucket
+
+
+@st.cache_data(ttl=600, max_entries=256, show_spinner=False)
+def _load_filtered_species(filter_signature: Tuple[str, str, str, str, str, str]) -> List[SpeciesRecord]:
+    # Healthy inputs only: a fallback species list, missing type index or missing
+    # attribute index raises, so no degraded result is ever cached.
+    generation_key, type_key, color_key, habitat_key, shape_key, capture_key = filter_signature
+    species = _filter_species_by_generation(_live_species_records(), generation_key)
+    resolved = _resolve_attribute_targets(color_key, habitat_key, shape_key, capture_key)
+    if resolved is None:
+        return []
+    targets, bucket = resolved
+    # Combine the type and attribute constraints as id sets first, then walk the
+    # generation slice once instead of materialising a list per filter stage.
+    allowed = None if type_key == "all" else _load_type_id_set(type_key)
+    if targets or bucket:
+        attribute_ids = _indexed_filter_ids(targets, bucket)
+        allowed = attribute_ids if allowed is None else attribute_ids & allowed
+    if allowed is None:
+        return species
+    return [record for record in species if record["id"] in allowed]
 
-        if color_key != "all":
-            target_color = COLOR_FILTERS.get(color_key)
-            if not target_color or color_val != target_color:
-                continue
-        if habitat_key != "all":
-            target_habitat = HABITAT_FILTERS.get(habitat_key)
-            if not target_habitat or habitat_val != target_habitat:
-                continue
-        if shape_key != "all":
-            target_shape = SHAPE_FILTERS.get(shape_key)
-            if not target_shape or shape_val != target_shape:
-                continue
-        if bucket:
-            low, high = bucket
-            if not isinstance(capture_rate, int):
-                continue
-            if not (low <= capture_rate <= high):
-                continue
-        result.append(record)
-    return result
+
+def _run_filter_pipeline(
+    filter_signature: Tuple[str, str, str, str, str, str]
+) -> Tuple[List[SpeciesRecord], bool]:
+    # Returns (matches, attribute filters skipped).
+    try:
+        return _load_filtered_species(filter_signature), False
+    except Exception:
+        pass
+    # Degraded: filter with whatever is available, uncached so a recovery shows on the next run.
+    generation_key, type_key, color_key, habitat_key, shape_key, capture_key = filter_signature
+    species = _filter_species_by_generation(load_species_records(), generation_key)
+    resolved = _resolve_attribute_targets(color_key, habitat_key, shape_key, capture_key)
+    if resolved is None:
+        return [], False
+    targets, bucket = resolved
+    species = _filter_species_by_type(species, type_key)
+    if not targets and not bucket:
+        return species, False
+    try:
+        # Inside the backoff window this raises at once, so the index is not rebuilt twice.
+        attribute_ids = _indexed_filter_ids(targets, bucket)
+    except Exception:
+        # No shared index: checking each species would mean up to ~1000 rate-limited
+        # requests on the script thread, so leave these filters off and say so.
+        return species, True
+    return [record for record in species if record["id"] in attribute_ids], False
+
+
+# Bounded above the dex size, so every species fits while the cache stays capped.
+@st.cache_data(ttl=60 * 60, max_entries=2048, show_spinner=False)
+def _load_entry(pokemon_id: int, name: str) -> Dict[str, object]:
+    entry = build_entry_from_api(pokemon_id, name)
+    if entry is None:
+        # Raise rather than return, so a transient fetch failure is never cached.
+        raise LookupError(f"could not build entry for #{pokemon_id}")
+    return entry
+
+
+def _build_entry(pokemon_id: int, name: str) -> Dict[str, object] | None:
+    try:
+        return _load_entry(pokemon_id, name)
+    except Exception:
+        return None
 
 
 def _format_filter_value(value: str | None) -> str:
     if not value:
         return ""
-    return value.replace("-", " ").title()
+    return titleize_slug(value)
 
 
 def _format_generation_slug(slug: str | None) -> str:
@@ -1401,6 +1748,26 @@ def _format_generation_slug(slug: str | None) -> str:
     return GENERATION_SLUG_LABELS.get(slug, slug.replace("generation-", "Generation ").replace("-", " ").title())
 
 
+# Label resolvers in filter_signature order: generation, type, color, habitat, shape, capture.
+_FILTER_RESOLVERS: Tuple[Callable[[str], str], ...] = (
+    lambda key: GENERATION_LABELS.get(key, ""),
+    lambda key: TYPE_LABELS.get(key, ""),
+    lambda key: _format_filter_value(COLOR_FILTERS.get(key)),
+    lambda key: _format_filter_value(HABITAT_FILTERS.get(key)),
+    lambda key: _format_filter_value(SHAPE_FILTERS.get(key)),
+    lambda key: CAPTURE_BUCKETS.get(key, ("", None))[0],
+)
+
+
+def _active_filter_meta(filter_values: Sequence[str]) -> str:
+    labels = (
+        resolve(value)
+        for resolve, value in zip(_FILTER_RESOLVERS, filter_values)
+        if value != "all"
+    )
+    return " · ".join(label for label in labels if label)
+
+
 def _render_metadata(metadata: Dict[str, object] | None) -> str:
     if not metadata:
         return ""
@@ -1423,25 +1790,25 @@ def _render_metadata(metadata: Dict[str, object] | None) -> str:
     if not details:
         return ""
     pills = "".join(
-        f'<div class="meta-pill"><span>{html.escape(label)}</span><strong>{html.escape(value)}</strong></div>'
+        f'<div class="meta-pill"><span>{_esc(label)}</span><strong>{_esc(value)}</strong></div>'
         for label, value in details
     )
     return f'<div class="meta-pill-grid">{pills}</div>'
 
 
-def _collect_evolution_paths(node: Dict[str, object]) -> List[List[Dict[str, object]]]:
-    paths: List[List[Dict[str, object]]] = []
-
-    def _dfs(current: Dict[str, object], trail: List[Dict[str, object]]) -> None:
-        chain = trail + [current]
+def _collect_evolution_paths(node: Dict[str, object]) -> List[Tuple[Dict[str, object], ...]]:
+    # Iterative DFS over (node, trail-so-far); children are pushed in reverse so
+    # root-to-leaf paths come out in the same order as a recursive walk.
+    paths: List[Tuple[Dict[str, object], ...]] = []
+    stack: List[Tuple[Dict[str, object], Tuple[Dict[str, object], ...]]] = [(node, ())]
+    while stack:
+        current, trail = stack.pop()
+        chain = (*trail, current)
         children = current.get("children") or []
         if not children:
             paths.append(chain)
-            return
-        for child in children:
-            _dfs(child, chain)
-
-    _dfs(node, [])
+            continue
+        stack.extend((child, chain) for child in reversed(children))
     return paths
 
 
@@ -1453,19 +1820,18 @@ def _render_evolution_paths(chain: Dict[str, object] | None) -> str:
     for path in paths:
         segments: List[str] = []
         for idx, stage in enumerate(path):
-            name = str(stage.get("name", "")).replace("-", " ").title()
-            pid = int(stage.get("id") or 0)
-            sprite = _pokemon_icon_url(name, pid if pid else None)
+            name = _format_filter_value(str(stage.get("name", "")))
+            # pokeapi_live._parse_chain_node always stores an int id (0 when unknown).
+            pid = stage["id"]
+            sprite = pokemon_icon_url(name, pid if pid else None)
             detail = str(stage.get("detail") or "")
-            detail_html = f'<div class="evo-detail">{html.escape(detail)}</div>' if detail else ""
-            node_html = "".join(
-                [
-                    '<div class="evo-node">',
-                    f'<img src="{sprite}" alt="{html.escape(name)}" />',
-                    f'<div class="evo-name">{html.escape(name)}</div>',
-                    detail_html,
-                    "</div>",
-                ]
+            detail_html = f'<div class="evo-detail">{_esc(detail)}</div>' if detail else ""
+            escaped_name = _esc(name)
+            node_html = (
+                '<div class="evo-node">'
+                f'<img src="{sprite}" alt="{escaped_name}" />'
+                f'<div class="evo-name">{escaped_name}</div>'
+                f"{detail_html}</div>"
             )
             if pid:
                 node_html = f'<a class="evo-node-link" href="?sprite={pid}" target="_self">{node_html}</a>'
@@ -1476,31 +1842,27 @@ def _render_evolution_paths(chain: Dict[str, object] | None) -> str:
     return '<div class="evo-wrapper">' + "".join(rows) + "</div>"
 
 
-def render_sprite_gallery(matches: List[Dict[str, object]]) -> None:
+def render_sprite_gallery(matches: List[SpeciesRecord]) -> None:
     st.markdown('<div class="gallery-title">Filtered Pokémon</div>', unsafe_allow_html=True)
     st.caption("Tap a sprite to open the full Pokédex entry.")
-    cols_per_row = 4
-    cols = st.columns(cols_per_row)
-    for idx, entry in enumerate(matches):
-        col = cols[idx % cols_per_row]
-        with col:
-            raw_name = str(entry.get("name", ""))
-            display_name = raw_name.capitalize()
-            pid = int(entry.get("id", 0))
-            icon = _pokemon_icon_url(raw_name, pid if pid else None)
-            st.markdown(
-                f'''
-                <a class="sprite-card" href="?sprite={pid}" target="_self">
-                  <img src="{icon}" alt="{display_name}" />
-                  <div>{display_name}</div>
-                </a>
-                ''',
-                unsafe_allow_html=True,
-            )
+    cards: List[str] = []
+    for entry in matches:
+        raw_name = entry["name"]
+        display_name = raw_name.capitalize()
+        pid = entry["id"]
+        icon = pokemon_icon_url(raw_name, pid if pid else None)
+        cards.append(
+            f'<a class="sprite-card" href="?sprite={pid}" target="_self">'
+            f'<img src="{icon}" alt="{display_name}" />'
+            f"<div>{display_name}</div>"
+            "</a>"
+        )
+    # One markdown element for the whole grid instead of one per sprite.
+    st.markdown(f'<div class="sprite-grid">{"".join(cards)}</div>', unsafe_allow_html=True)
 
 
 def render_entry_html(entry: Dict[str, object], fallback_icon_b64: str) -> str:
-    sections_html = "".join(render_section(section) for section in entry["sections"])
+    sections_html = "".join([render_section(section) for section in entry["sections"]])
     category = str(entry.get("category", ""))
     name = str(entry.get("name", ""))
 
@@ -1510,52 +1872,79 @@ def render_entry_html(entry: Dict[str, object], fallback_icon_b64: str) -> str:
     if sprite_override:
         display_src_raw = str(sprite_override)
     elif is_pokemon:
-        display_src_raw = _pokemon_icon_url(name, pid if pid else None)
+        display_src_raw = pokemon_icon_url(name, pid if pid else None)
     else:
         display_src_raw = f"data:image/svg+xml;base64,{fallback_icon_b64}"
-    icon_src = html.escape(display_src_raw, quote=True)
+    icon_src = _esc(display_src_raw)
     alt_text = f"{name} icon" if is_pokemon else "Pixel icon"
 
     metadata_html = _render_metadata(entry.get("metadata"))
     evolution_html = _render_evolution_paths(entry.get("evolution_chain"))
 
-    parts = [
-        '<div class="poke-card">',
-        '  <div class="card-header">',
-        f'    <img class="pixel-icon" src="{icon_src}" alt="{html.escape(alt_text)}" />',
-        "    <div>",
-        f'      <div class="name">{html.escape(name)}</div>',
-        f'      <div class="meta">{html.escape(category)} · #{entry["index"]}</div>',
-        "    </div>",
-        "  </div>",
-        f"  <p>{html.escape(entry['description'])}</p>",
-        f"  <div class=\"section-grid\">{sections_html}</div>",
-    ]
-    if metadata_html:
-        parts.append(metadata_html)
-    if evolution_html:
-        parts.append(evolution_html)
-    parts.append("</div>")
-    return "\n".join(parts)
+    metadata_part = f"\n{metadata_html}" if metadata_html else ""
+    evolution_part = f"\n{evolution_html}" if evolution_html else ""
+    return (
+        '<div class="poke-card">\n'
+        '  <div class="card-header">\n'
+        f'    <img class="pixel-icon" src="{icon_src}" alt="{_esc(alt_text)}" />\n'
+        "    <div>\n"
+        f'      <div class="name">{_esc(name)}</div>\n'
+        f'      <div class="meta">{_esc(category)} · #{entry["index"]}</div>\n'
+        "    </div>\n"
+        "  </div>\n"
+        f"  <p>{_esc(entry['description'])}</p>\n"
+        f'  <div class="section-grid">{sections_html}</div>'
+        f"{metadata_part}{evolution_part}\n"
+        "</div>"
+    )
+
+
+def _build_entries_progressively(
+    matches: Sequence[SpeciesRecord], placeholder: st.delta_generator.DeltaGenerator
+) -> List[Dict[str, object]]:
+    # Each entry is a few PokéAPI round-trips; build them concurrently and paint each
+    # card as soon as it lands (in match order) rather than after the slowest one.
+    futures = {
+        _io_executor().submit(_build_entry, record["id"], record["name"]): pos
+        for pos, record in enumerate(matches)
+    }
+    built: List[Dict[str, object] | None] = [None] * len(matches)
+    cards: List[str] = [""] * len(matches)
+    for future in as_completed(futures):
+        pos = futures[future]
+        entry = future.result()
+        if entry:
+            built[pos] = entry
+            cards[pos] = render_entry_html(entry, PIXEL_ICON_B64)
+            placeholder.markdown(f'<div class="entry-grid">{"".join(cards)}</div>', unsafe_allow_html=True)
+    return [entry for entry in built if entry]
 
 
 def render_history(icon_b64: str) -> None:
-    history: List[Dict[str, object]] = [
-        entry for entry in st.session_state.history if isinstance(entry, dict)
-    ]
+    # add_to_history only admits dict groups holding dict entries, so no re-checking here.
+    history = st.session_state.history
     if not history:
         return
 
-    for entry_group in history[:PAGE_SIZE]:
+    groups_html: List[str] = []
+    for entry_group in islice(history, PAGE_SIZE):
+        # History groups never change once added, so each is rendered once and the
+        # HTML kept on the group itself (icon_b64 is always PIXEL_ICON_B64).
+        cached_html = entry_group.get("html")
+        if cached_html is not None:
+            if cached_html:
+                groups_html.append(cached_html)
+            continue
+        entry_group["html"] = ""
         shortcuts_html = "".join(
-            f'<span class="shortcut-pill">{html.escape(sc)}</span>' for sc in entry_group["shortcuts"]
+            [f'<span class="shortcut-pill">{_esc(sc)}</span>' for sc in entry_group["shortcuts"]]
         )
-        entries_payload = [entry for entry in entry_group.get("entries", []) if isinstance(entry, dict)]
+        entries_payload = entry_group["entries"]
         if not entries_payload:
             continue
         meta_raw = str(entry_group.get("meta", "")).strip()
-        meta_text = html.escape(meta_raw) if meta_raw else ""
-        entries_html = "".join(render_entry_html(entry, icon_b64) for entry in entries_payload)
+        meta_text = _esc(meta_raw) if meta_raw else ""
+        entries_html = "".join([render_entry_html(entry, icon_b64) for entry in entries_payload])
         meta_badge = f'<div class="history-meta-badge">{meta_text}</div>' if meta_text else ""
         group_html = (
             '<div class="history-group">'
@@ -1564,22 +1953,40 @@ def render_history(icon_b64: str) -> None:
             f'<div class="entry-grid">{entries_html}</div>'
             "</div>"
         )
-        st.markdown(group_html, unsafe_allow_html=True)
+        entry_group["html"] = group_html
+        groups_html.append(group_html)
+    if groups_html:
+        st.markdown("".join(groups_html), unsafe_allow_html=True)
+
+
+def _warm_caches() -> None:
+    # Runs off the script thread, so it must not touch st.session_state. None of these
+    # cache a failure, so a step that fails here is simply retried on first use.
+    pokemon_of_the_day(_utc_day_key())
+    for type_key, type_label in TYPE_FILTERS.items():
+        if type_label:
+            _type_id_set(type_key)
+    try:
+        load_species_attribute_index()
+    except Exception:
+        pass
+
+
+@st.cache_resource(show_spinner=False)
+def _start_cache_warmup() -> threading.Thread:
+    # cache_resource makes this run once per server process, not per session.
+    worker = threading.Thread(target=_warm_caches, name="pokesearch-warmup", daemon=True)
+    worker.start()
+    return worker
 
 
 def main() -> None:
+    _start_cache_warmup()
     assets = set_page_metadata()
     ensure_state()
 
-    base_path = Path(__file__).parent
-    fallback_svg = (
-        "<svg xmlns='http://www.w3.org/2000/svg' width='16' height='16'>"
-        "<rect width='16' height='16' fill='#ffde00'/>"
-        "</svg>"
-    )
-    pixel_icon_b64 = base64.b64encode(fallback_svg.encode("utf-8")).decode("utf-8")
-
-    species_index = load_species_index()
+    species_index = load_species_records()
+    species_by_id, species_name_lower = load_species_lookup()
     sprite_param = st.query_params.get("sprite")
     if sprite_param:
         display_name = None
@@ -1588,9 +1995,9 @@ def main() -> None:
         except (TypeError, ValueError):
             sprite_id = None
         if sprite_id:
-            match = next((s for s in species_index if int(s.get("id", 0)) == sprite_id), None)
+            match = species_by_id.get(sprite_id)
             if match:
-                display_name = str(match.get("name", "")).title()
+                display_name = match["name"].title()
         if sprite_id and display_name:
             st.session_state["pending_lookup_id"] = sprite_id
             st.session_state["force_search_query"] = display_name
@@ -1603,18 +2010,11 @@ def main() -> None:
     query_trimmed = ""
     filters_active = False
     filtered_species_index = list(species_index)
-    shortcuts: Dict[str, str] = {}
-    selected_generation = st.session_state.get("generation_filter", "all")
-    selected_type = st.session_state.get("type_filter", "all")
-    color_filter = st.session_state.get("color_filter", "all")
-    habitat_filter = st.session_state.get("habitat_filter", "all")
-    shape_filter = st.session_state.get("shape_filter", "all")
-    capture_filter = st.session_state.get("capture_filter", "all")
 
     left_col, right_col = st.columns([1, 2], gap="large", vertical_alignment="top")
 
     with left_col:
-        logo_path = resolve_asset_path("PokeSearch_logo.png", base_path)
+        logo_path = resolve_cached_asset_path("PokeSearch_logo.png", BASE_PATH)
         logo_b64 = load_file_as_base64(logo_path) if logo_path else None
         if logo_b64:
             st.markdown(
@@ -1628,9 +2028,9 @@ def main() -> None:
                 '<div class="logo-wrapper"><h1>PokéSearch!</h1></div>',
                 unsafe_allow_html=True,
             )
-        pod = pokemon_of_the_day()
+        pod = pokemon_of_the_day(_utc_day_key())
         if pod:
-            sprite = pod.get("sprite") or _pokemon_icon_url(pod.get("name", ""), int(pod.get("id") or 0))
+            sprite = pod.get("sprite") or pokemon_icon_url(pod["name"], pod["id"])
             def _handle_view_stats() -> None:
                 st.session_state["pending_lookup_id"] = pod.get("id")
                 st.session_state["force_search_query"] = pod.get("name", "")
@@ -1712,24 +2112,8 @@ def main() -> None:
             if msg := st.session_state.get("search_feedback"):
                 feedback_slot.warning(msg)
 
-            history_entries = [
-                entry for entry in st.session_state.history if isinstance(entry, dict)
-            ]
-            history_placeholder = "__history_placeholder__"
-            history_clear = "__history_clear__"
-            history_tokens: List[str] = [history_placeholder]
-            if history_entries:
-                history_labels: Dict[str, str] = {history_placeholder: ""}
-            else:
-                history_labels = {history_placeholder: "(no history)"}
-            for idx, entry_group in enumerate(history_entries):
-                display_query = entry_group.get("query") or entry_group.get("label") or "Past search"
-                history_token = f"entry_{idx}"
-                history_tokens.append(history_token)
-                history_labels[history_token] = f"{idx + 1}. {display_query}"
-            if history_entries:
-                history_tokens.append(history_clear)
-                history_labels[history_clear] = "Clear history"
+            history_entries = st.session_state.history
+            history_tokens, history_labels = _history_options(history_entries)
             st.markdown('<div class="history-select-wrapper">', unsafe_allow_html=True)
             history_choice = st.selectbox(
                 "Search History",
@@ -1738,105 +2122,75 @@ def main() -> None:
                 label_visibility="visible",
                 key="history_select",
             )
-            if history_entries and history_choice == history_clear:
-                st.session_state.history = []
+            if history_entries and history_choice == HISTORY_CLEAR:
+                st.session_state.history.clear()
                 st.rerun()
-            if history_entries and history_choice not in {history_placeholder, history_clear}:
-                parts = history_choice.split("_", 1)
-                if len(parts) == 2 and parts[0] == "entry":
-                    idx = int(parts[1])
-                    if 0 <= idx < len(history_entries):
-                        chosen_entry = history_entries[idx]
-                        restored_query = str(chosen_entry.get("query") or chosen_entry.get("label") or "")
-                        st.session_state["search_prefill"] = restored_query
-                        st.rerun()
+            if history_entries and isinstance(history_choice, int):
+                if 0 <= history_choice < len(history_entries):
+                    chosen_entry = history_entries[history_choice]
+                    restored_query = str(chosen_entry.get("query") or chosen_entry.get("label") or "")
+                    st.session_state["search_prefill"] = restored_query
+                    st.rerun()
 
             generation_choice = st.selectbox(
                 "Generation",
-                list(GENERATION_FILTERS.keys()),
+                GENERATION_FILTER_KEYS,
                 key="generation_filter",
-                format_func=lambda key: "Generation" if key == "all" else GENERATION_LABELS.get(key, key.title()),
+                format_func=_fmt_generation,
                 label_visibility="collapsed",
             )
             type_choice = st.selectbox(
                 "Type",
-                list(TYPE_FILTERS.keys()),
+                TYPE_FILTER_KEYS,
                 key="type_filter",
-                format_func=lambda key: "Type" if key == "all" else TYPE_LABELS.get(key, key.title()),
+                format_func=_fmt_type,
                 label_visibility="collapsed",
             )
             color_choice = st.selectbox(
                 "Color",
-                list(COLOR_FILTERS.keys()),
+                COLOR_FILTER_KEYS,
                 key="color_filter",
-                format_func=lambda key: "Color" if key == "all" else key.replace("-", " ").title(),
+                format_func=_fmt_color,
                 label_visibility="collapsed",
             )
             habitat_choice = st.selectbox(
                 "Habitat",
-                list(HABITAT_FILTERS.keys()),
+                HABITAT_FILTER_KEYS,
                 key="habitat_filter",
-                format_func=lambda key: "Habitat" if key == "all" else key.replace("-", " ").title(),
+                format_func=_fmt_habitat,
                 label_visibility="collapsed",
             )
             shape_choice = st.selectbox(
                 "Body Shape",
-                list(SHAPE_FILTERS.keys()),
+                SHAPE_FILTER_KEYS,
                 key="shape_filter",
-                format_func=lambda key: "Body Shape" if key == "all" else key.replace("-", " ").title(),
+                format_func=_fmt_shape,
                 label_visibility="collapsed",
             )
             capture_choice = st.selectbox(
                 "Capture Rate",
-                list(CAPTURE_BUCKETS.keys()),
+                CAPTURE_FILTER_KEYS,
                 key="capture_filter",
-                format_func=lambda key: "Capture Rate" if key == "all" else CAPTURE_BUCKETS[key][0],
+                format_func=_fmt_capture,
                 label_visibility="collapsed",
             )
             st.markdown("</div>", unsafe_allow_html=True)
 
-            selected_generation = generation_choice
-            selected_type = type_choice
-            color_filter = color_choice
-            habitat_filter = habitat_choice
-            shape_filter = shape_choice
-            capture_filter = capture_choice
-
-            filter_values = {
-                "generation": generation_choice,
-                "type": type_choice,
-                "color": color_choice,
-                "habitat": habitat_choice,
-                "shape": shape_choice,
-                "capture": capture_choice,
-            }
-            filters_active = any(value != "all" for value in filter_values.values())
-            filtered_species_index = _filter_species_by_generation(
-                species_index, generation_choice
-            )
-            filtered_species_index = _filter_species_by_type(
-                filtered_species_index, type_choice
-            )
-            filtered_species_index = _apply_additional_filters(
-                filtered_species_index,
+            filter_signature = (
+                generation_choice,
+                type_choice,
                 color_choice,
                 habitat_choice,
                 shape_choice,
                 capture_choice,
             )
-            shortcuts = {}
-            if selected_generation != "all":
-                shortcuts["@generation"] = GENERATION_LABELS.get(selected_generation, "")
-            if selected_type != "all":
-                shortcuts["@type"] = TYPE_LABELS.get(selected_type, "")
-            if color_filter != "all":
-                shortcuts["@color"] = color_filter.replace("-", " ").title()
-            if habitat_filter != "all":
-                shortcuts["@habitat"] = habitat_filter.replace("-", " ").title()
-            if shape_filter != "all":
-                shortcuts["@shape"] = shape_filter.replace("-", " ").title()
-            if capture_filter != "all":
-                shortcuts["@capture"] = CAPTURE_BUCKETS.get(capture_filter, ("", None))[0]
+            filters_active = any(value != "all" for value in filter_signature)
+            filtered_species_index, attribute_filters_skipped = _run_filter_pipeline(filter_signature)
+            if attribute_filters_skipped:
+                st.warning(
+                    "Color, habitat, shape and capture filters are unavailable right now, "
+                    "so they were not applied."
+                )
     results_container = right_col.container()
     with results_container:
         gallery_placeholder = st.empty()
@@ -1847,26 +2201,14 @@ def main() -> None:
         st.session_state["enter_submit"] = False
 
     with history_container:
-        render_history(pixel_icon_b64)
+        render_history(PIXEL_ICON_B64)
 
     footer_logo = assets.get("pokeapi_logo")
     if footer_logo:
-        powered_by = (
-            '<span class="footer-powered">Powered by '
-            f'<img src="data:image/png;base64,{footer_logo}" alt="PokéAPI logo" /></span>'
-        )
+        powered_by = FOOTER_POWERED_BY_LOGO.format(logo_b64=footer_logo)
     else:
-        powered_by = '<span class="footer-powered">Powered by PokéAPI</span>'
-    st.markdown(
-        f"""
-        <div class="footer-bar">
-          <span>Crafted by Jaro Gee. Pokémon and Pokémon character names are trademarks of Nintendo, Creatures, and GAME FREAK.</span>
-          <span>All artwork (logos, background, sprites) © their respective owners and is used here in a non-commercial fan project.</span>
-          {powered_by}
-        </div>
-        """,
-        unsafe_allow_html=True,
-    )
+        powered_by = FOOTER_POWERED_BY_TEXT
+    st.markdown(FOOTER_TEMPLATE.format(powered_by=powered_by), unsafe_allow_html=True)
 
     if pending_lookup_trigger:
         search_clicked = True
@@ -1879,12 +2221,23 @@ def main() -> None:
             st.rerun()
             return
         if query_trimmed.isdigit():
-            matches = [
-                s for s in filtered_species_index if int(s.get("id", 0)) == int(query_trimmed)
-            ]
+            target_id = int(query_trimmed)
+            record = species_by_id.get(target_id)
+            if record and filters_active:
+                # Filtered records stay in id order, so membership is one bisect.
+                pos = bisect_left(filtered_species_index, target_id, key=_species_id)
+                in_filter = pos < len(filtered_species_index) and filtered_species_index[pos]["id"] == target_id
+                record = record if in_filter else None
+            matches = [record] if record else []
+        elif query_trimmed and not filters_active and "\n" not in query_trimmed:
+            matches = _search_species_names(query_trimmed.lower())
         elif query_trimmed:
             needle = query_trimmed.lower()
-            matches = [s for s in filtered_species_index if needle in str(s["name"]).lower()]
+            matches = [
+                s
+                for s in filtered_species_index
+                if needle in (species_name_lower.get(s["id"]) or s["name"].lower())
+            ]
         else:
             matches = filtered_species_index
         if not matches:
@@ -1896,24 +2249,26 @@ def main() -> None:
             with gallery_placeholder.container():
                 render_sprite_gallery(matches)
             return
-        limit = len(matches)
-        built: List[Dict[str, object]] = []
-        for s in matches[:limit]:
-            built_entry = build_entry_from_api(int(s["id"]), str(s["name"]))
-            if built_entry:
-                built.append(built_entry)
-        serialized = built
+        # Key on the records actually being built: a different query or filter mix that
+        # lands on the same matches reuses the entries, and the same query can never
+        # reuse entries for a result set that has since changed.
+        search_key = tuple((record["id"], record["name"]) for record in matches)
+        cached_results = st.session_state.get("last_results")
+        if st.session_state.get("last_search_key") == search_key and cached_results is not None:
+            # Same result set again: reuse the built entries by reference; history snapshots the list.
+            serialized = cached_results
+        else:
+            serialized = _build_entries_progressively(matches, gallery_placeholder)
+            if len(serialized) == len(matches):
+                st.session_state["last_search_key"] = search_key
+                st.session_state["last_results"] = serialized
+            else:
+                # Some builds failed (and were not cached); retry them next time rather
+                # than pinning the partial list to this result set.
+                st.session_state.pop("last_search_key", None)
+                st.session_state.pop("last_results", None)
         label = query_trimmed or "Full Library"
-        filter_labels = [
-            ("Generation", selected_generation != "all", GENERATION_LABELS.get(selected_generation, "")),
-            ("Type", selected_type != "all", TYPE_LABELS.get(selected_type, "")),
-            ("Color", color_filter != "all", _format_filter_value(COLOR_FILTERS.get(color_filter))),
-            ("Habitat", habitat_filter != "all", _format_filter_value(HABITAT_FILTERS.get(habitat_filter))),
-            ("Shape", shape_filter != "all", _format_filter_value(SHAPE_FILTERS.get(shape_filter))),
-            ("Capture", capture_filter != "all", CAPTURE_BUCKETS.get(capture_filter, ("", None))[0]),
-        ]
-        meta_parts = [text for _label, active, text in filter_labels if active and text]
-        meta_text = " · ".join(meta_parts)
+        meta_text = _active_filter_meta(filter_signature)
         add_to_history(make_history_entry(label, query_trimmed, serialized, meta_text, []))
         st.rerun()
 
@@ -1922,45 +2277,26 @@ def main() -> None:
         if not filtered_species_index:
             st.warning("No Pokémon match the current filters. Try a different combination.")
             return
-        pool_key = "|".join(
-            [
-                selected_generation,
-                selected_type,
-                color_filter,
-                habitat_filter,
-                shape_filter,
-                capture_filter,
-            ]
-        )
-        rand_pool = st.session_state.setdefault("rand_pool_map", {})
-        pool = rand_pool.get(pool_key, [])
-        if not pool:
-            pool = [
-                int(record.get("id", 0))
-                for record in filtered_species_index
-                if int(record.get("id", 0))
-            ]
-            random.shuffle(pool)
-            rand_pool[pool_key] = pool
-        if not pool:
-            st.warning("No Pokémon match the current filters. Try a different combination.")
-            return
-        idx = int(pool.pop())
-        name_guess = next(
-            (str(s["name"]) for s in filtered_species_index if int(s.get("id", 0)) == idx),
-            f"#{idx:03d}" if idx else "Random Pick",
-        )
-        built_entry = build_entry_from_api(idx, name_guess) if idx else None
-        entry = built_entry if built_entry else serialize_entry(random.choice(DATASET))
-        filter_summary = [
-            GENERATION_LABELS.get(selected_generation, "") if selected_generation != "all" else "",
-            TYPE_LABELS.get(selected_type, "") if selected_type != "all" else "",
-            _format_filter_value(COLOR_FILTERS.get(color_filter)) if color_filter != "all" else "",
-            _format_filter_value(HABITAT_FILTERS.get(habitat_filter)) if habitat_filter != "all" else "",
-            _format_filter_value(SHAPE_FILTERS.get(shape_filter)) if shape_filter != "all" else "",
-            CAPTURE_BUCKETS.get(capture_filter, ("", None))[0] if capture_filter != "all" else "",
-        ]
-        meta_text = " · ".join([text for text in filter_summary if text]) or "Random pick"
+        pool_key = filter_signature
+        # Each filter combination keeps only (seed, cursor); the visit order is
+        # regenerated from the seed, so the full id pool never lives in session state.
+        rand_pool = st.session_state.setdefault("rand_pool_map", OrderedDict())
+        pool_size = len(filtered_species_index)
+        seed, cursor = rand_pool.get(pool_key, (None, 0))
+        if seed is None or cursor >= pool_size:
+            seed, cursor = random.getrandbits(64), 0
+        order = shuffled_order(seed, pool_size)
+        idx = filtered_species_index[order[cursor]]["id"]
+        rand_pool[pool_key] = (seed, cursor + 1)
+        # Keep only the most recently used filter combinations.
+        rand_pool.move_to_end(pool_key)
+        while len(rand_pool) > MAX_RANDOM_POOLS:
+            rand_pool.popitem(last=False)
+        picked = species_by_id.get(idx)
+        name_guess = picked["name"] if picked else (f"#{idx:03d}" if idx else "Random Pick")
+        built_entry = _build_entry(idx, name_guess) if idx else None
+        entry = built_entry if built_entry else random.choice(SERIALIZED_DATASET)
+        meta_text = _active_filter_meta(filter_signature) or "Random pick"
         add_to_history(
             make_history_entry(
                 entry.get("name", name_guess),